@@ -1,6 +1,11 @@
 from sqlalchemy.orm import DeclarativeBase
 
+from app.settings import get_settings
+
+# Loader strategy for relationships that aren't eagerly loaded by default.
+# Set APP_RAISE_ON_LAZY_LOAD=1 to turn accidental lazy loads (N+1 queries) into errors.
+DEFAULT_LAZY = "raise" if get_settings().raise_on_lazy_load else "select"
+
 
 class Base(DeclarativeBase):
     """Declarative base for all ORM models."""
-
@@ -2,14 +2,30 @@ from __future__ import annotations
 
 import logging
 
-from sqlalchemy import event
+from sqlalchemy import Result, bindparam, event
 from sqlalchemy.orm import Session, with_loader_criteria
 
+from app.models.hr import Employee, PerformanceReview
+from app.security.context import FILTER_DEPARTMENT, FILTER_SENSITIVE
+
 logger = logging.getLogger(__name__)
 
+# Built once and shared by every query: the department id is supplied per execution
+# as the "authz_dept_id" bound parameter, so SQLAlchemy can reuse the cached compiled form.
+_DEPT_OPTS = (
+    with_loader_criteria(Employee, lambda cls: cls.department_id == bindparam("authz_dept_id"), include_aliases=True),
+    with_loader_criteria(
+        PerformanceReview, lambda cls: cls.department_id == bindparam("authz_dept_id"), include_aliases=True
+    ),
+)
+_SENSITIVE_OPTS = (
+    with_loader_criteria(Employee, lambda cls: cls.is_sensitive.is_(False), include_aliases=True),
+    with_loader_criteria(PerformanceReview, lambda cls: cls.is_sensitive.is_(False), include_aliases=True),
+)
+
 
 @event.listens_for(Session, "do_orm_execute")
-def _apply_authorization_filters(execute_state) -> None:
+def _apply_authorization_filters(execute_state) -> Result | None:
     """
     Transparent data scoping.
 
@@ -18,32 +34,28 @@ def _apply_authorization_filters(execute_state) -> None:
     still returns department-scoped + sensitivity-scoped rows when required.
     """
 
-    if not execute_state.is_select:
-        return
-
     authz = execute_state.session.info.get("authz")
-    if authz is None:
+    if authz is None or not authz.filter_mask or not execute_state.is_select:
         return
-
-    # Local import to avoid cycles.
-    from app.models.hr import Employee, PerformanceReview  # noqa: WPS433 (local import)
+    mask = authz.filter_mask
 
     stmt = execute_state.statement
+    dept_id = None
 
-    if authz.filter_by_department and not authz.can_view_cross_department:
+    if mask & FILTER_DEPARTMENT:
         dept_id = authz.department_id
         logger.debug("Applying department filter dept_id=%s", dept_id)
-        stmt = stmt.options(
-            with_loader_criteria(Employee, lambda cls: cls.department_id == dept_id, include_aliases=True),
-            with_loader_criteria(PerformanceReview, lambda cls: cls.department_id == dept_id, include_aliases=True),
-        )
+        stmt = stmt.options(*_DEPT_OPTS)
 
-    if authz.require_sensitive_permission and not authz.can_view_sensitive_data:
+    if mask & FILTER_SENSITIVE:
         logger.debug("Applying sensitive-row filter (hide sensitive rows)")
-        stmt = stmt.options(
-            with_loader_criteria(Employee, lambda cls: cls.is_sensitive.is_(False), include_aliases=True),
-            with_loader_criteria(PerformanceReview, lambda cls: cls.is_sensitive.is_(False), include_aliases=True),
-        )
+        stmt = stmt.options(*_SENSITIVE_OPTS)
 
-    execute_state.statement = stmt
+    if dept_id is None:
+        execute_state.statement = stmt
+        return
 
+    # Bound values can't be attached to the shared options, so re-invoke the
+    # statement with the department id merged into the execution parameters.
+    execute_state.parameters = {**(execute_state.parameters or {}), "authz_dept_id": dept_id}
+    return execute_state.invoke_statement(statement=stmt)
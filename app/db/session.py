@@ -6,14 +6,33 @@ from fastapi import Request
 from sqlalchemy import create_engine
 from sqlalchemy.orm import Session, sessionmaker
 
+from app.security.context import AuthzContext
 from app.settings import get_settings
 
 
 _settings = get_settings()
+_db_url = _settings.resolved_db_url()
+
+_is_sqlite = _db_url.startswith("sqlite")
+
+# Server databases: pool sizing comes from settings. SQLite picks its own pool
+# class, which doesn't take these.
+_pool_kwargs = (
+    {}
+    if _is_sqlite
+    else {
+        "pool_size": _settings.db_pool_size,
+        "max_overflow": _settings.db_max_overflow,
+        "pool_recycle": _settings.db_pool_recycle,
+    }
+)
 
 engine = create_engine(
-    _settings.resolved_db_url(),
-    connect_args={"check_same_thread": False} if _settings.resolved_db_url().startswith("sqlite") else {},
+    _db_url,
+    connect_args={"check_same_thread": False} if _is_sqlite else {},
+    pool_pre_ping=True,
+    query_cache_size=_settings.db_query_cache_size,
+    **_pool_kwargs,
 )
 
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False, class_=Session)
@@ -32,8 +51,13 @@ def get_db(request: Request) -> Generator[Session, None, None]:
     try:
         authz = getattr(getattr(request, "state", None), "authz", None)
         if authz is not None:
-            db.info["authz"] = authz
+            attach_authz(db, authz)
         yield db
     finally:
         db.close()
 
+
+def attach_authz(db: Session, authz: AuthzContext) -> None:
+    """Scope a session to the request's authz context (read by app/db/filters.py)."""
+
+    db.info["authz"] = authz
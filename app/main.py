@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import logging
 from contextlib import asynccontextmanager
 
 from fastapi import Depends, FastAPI
@@ -9,9 +10,12 @@ from app.db.init_db import init_db
 from app.logging_config import configure_app_logging
 from app.routers import admin, decorator_demo, employees, health, performance_reviews
 from app.security.config import load_security_config
+from app.security.decorators import collect_endpoint_security
 from app.security.dependencies import enforce_security
 from app.settings import get_settings
 
+logger = logging.getLogger(__name__)
+
 
 def create_app() -> FastAPI:
     @asynccontextmanager
@@ -20,13 +24,12 @@ def create_app() -> FastAPI:
         settings = get_settings()
         configure_app_logging(settings.log_level)
 
-        import logging
-
-        logger = logging.getLogger(__name__)
         logger.info("App startup beginning")
 
-        app.state.security_config = load_security_config(settings.resolved_security_config_path())
-        logger.info("Loaded security config: %s", settings.resolved_security_config_path())
+        security_config_path = settings.resolved_security_config_path()
+        app.state.security_config = load_security_config(security_config_path)
+        logger.info("Loaded security config: %s", security_config_path)
+        app.state.endpoint_security = collect_endpoint_security(app.routes)
         init_db()
         logger.info("Database initialized (tables ensured + seed if needed)")
 
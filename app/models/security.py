@@ -2,10 +2,23 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, Table, Text, UniqueConstraint
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    SmallInteger,
+    String,
+    Table,
+    Text,
+    UniqueConstraint,
+    func,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.db.base import Base
+from app.db.base import DEFAULT_LAZY, Base
 
 
 class Department(Base):
@@ -16,27 +29,34 @@ class Department(Base):
     code: Mapped[str] = mapped_column(String(10), unique=True, nullable=False)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
 
-    users: Mapped[list["User"]] = relationship(back_populates="department")
+    users: Mapped[list["User"]] = relationship(back_populates="department", lazy=DEFAULT_LAZY)
+
 
+# Role cardinality is tiny, so role ids fit in a SMALLINT. SQLite only auto-assigns
+# ids for "INTEGER PRIMARY KEY", so it keeps INTEGER there.
+_ROLE_ID_TYPE = SmallInteger().with_variant(Integer, "sqlite")
 
 user_roles = Table(
     "user_roles",
     Base.metadata,
     Column("user_id", ForeignKey("users.id"), primary_key=True),
-    Column("role_id", ForeignKey("roles.id"), primary_key=True),
+    Column("role_id", _ROLE_ID_TYPE, ForeignKey("roles.id"), primary_key=True),
+    # Reverse lookup: all users holding a given role.
+    Index("ix_user_roles_role_user", "role_id", "user_id"),
 )
 
 
 class Role(Base):
     __tablename__ = "roles"
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    id: Mapped[int] = mapped_column(_ROLE_ID_TYPE, primary_key=True)
     name: Mapped[str] = mapped_column(String(50), unique=True, nullable=False)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     users: Mapped[list["User"]] = relationship(
         secondary=user_roles,
         back_populates="roles",
+        lazy=DEFAULT_LAZY,
     )
 
 
@@ -54,11 +74,13 @@ class User(Base):
     department_id: Mapped[int] = mapped_column(ForeignKey("departments.id"), nullable=False, index=True)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
 
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), nullable=False)
 
-    department: Mapped[Department] = relationship(back_populates="users")
+    # Both are read on every authenticated request, so load them eagerly by default.
+    department: Mapped[Department] = relationship(back_populates="users", lazy="joined")
     roles: Mapped[list[Role]] = relationship(
         secondary=user_roles,
         back_populates="users",
+        lazy="selectin",
     )
 
@@ -0,0 +1,10 @@
+"""JSON decoding for JWKS / Graph responses: orjson when installed, stdlib otherwise."""
+
+from __future__ import annotations
+
+try:
+    from orjson import loads
+except ImportError:  # orjson is an optional speedup (pip install .[fast])
+    from json import loads
+
+__all__ = ["loads"]
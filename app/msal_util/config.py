@@ -33,6 +33,10 @@ class EntraConfig:
     Optional:
         CLOCK_SKEW_SECONDS: Seconds of tolerance for exp/nbf (default 120).
         JWKS_CACHE_TTL_SECONDS: How long to cache JWKS (default 3600).
+        JWKS_MAX_STALE_SECONDS: How long past expiry cached JWKS may still be
+            used while the JWKS endpoint is failing (default 0: fail closed).
+        JWT_FAST_VERIFY: Set to 1 or true to verify RS256 directly with
+            ``cryptography`` instead of through PyJWT (same checks).
 
     For Microsoft Graph fallback (roles when not in token):
         MSAL_GRAPH_ENABLED: Set to 1 or true to enable Graph fallback.
@@ -46,6 +50,8 @@ class EntraConfig:
     jwks_cache_ttl_seconds: int
     graph_enabled: bool
     client_secret: str | None
+    fast_verify: bool = False
+    jwks_max_stale_seconds: int = 0
 
     @property
     def expected_audience(self) -> str:
@@ -73,6 +79,8 @@ class EntraConfig:
             jwks_cache_ttl_seconds=_getenv_int("JWKS_CACHE_TTL_SECONDS", 3600),
             graph_enabled=_getenv("MSAL_GRAPH_ENABLED", "").strip().lower() in ("1", "true", "yes"),
             client_secret=_strip_or_none(_getenv("AZURE_CLIENT_SECRET")),
+            fast_verify=_getenv("JWT_FAST_VERIFY", "").strip().lower() in ("1", "true", "yes"),
+            jwks_max_stale_seconds=_getenv_int("JWKS_MAX_STALE_SECONDS", 0),
         )
 
 
@@ -24,11 +24,13 @@ Uses client credentials (app-only) to call Graph. Required application permissio
 from __future__ import annotations
 
 import logging
+import threading
 import time
 from typing import Any
 
 import requests
 
+from ._json import loads
 from .config import EntraConfig
 
 logger = logging.getLogger(__name__)
@@ -36,6 +38,13 @@ logger = logging.getLogger(__name__)
 GRAPH_BASE = "https://graph.microsoft.com/v1.0"
 TOKEN_URL_TEMPLATE = "https://login.microsoftonline.com/{tenant_id}/oauth2/v2.0/token"
 
+# Shared session: keeps TCP+TLS connections to login.microsoftonline.com and
+# graph.microsoft.com alive across calls instead of reconnecting every time.
+_HTTP = requests.Session()
+
+_ODATA_TYPE_KEY = "@odata.type"
+_DISPLAY_NAME_KEY = "displayName"
+
 # Types returned by the /memberOf endpoint that we treat as "role" sources.
 # We deliberately skip administrativeUnit and other non-group types.
 _GROUP_TYPES = frozenset({
@@ -53,15 +62,23 @@ class _AppTokenCache:
     def __init__(self) -> None:
         self._token: str | None = None
         self._expires_at: float = 0.0
+        # Only one caller requests a new token; concurrent callers wait for it.
+        self._lock = threading.Lock()
 
     def get_or_refresh(self, config: EntraConfig) -> str:
-        now = time.monotonic()
-        if self._token and now < self._expires_at:
-            return self._token
-        self._token, expires_in = _request_app_token(config)
-        # Cache with 5 min safety margin (tokens are usually valid ~1 hour)
-        self._expires_at = now + max(expires_in - 300, 60)
-        return self._token
+        token = self._token
+        if token and time.monotonic() < self._expires_at:
+            return token
+        with self._lock:
+            now = time.monotonic()
+            # Re-check: another thread may have refreshed while we waited.
+            if self._token and now < self._expires_at:
+                return self._token
+            token, expires_in = _request_app_token(config)
+            # Cache with 5 min safety margin (tokens are usually valid ~1 hour)
+            self._expires_at = now + max(expires_in - 300, 60)
+            self._token = token
+            return token
 
 
 _app_token_cache = _AppTokenCache()
@@ -82,7 +99,7 @@ def _request_app_token(config: EntraConfig) -> tuple[str, int]:
         "scope": "https://graph.microsoft.com/.default",
         "grant_type": "client_credentials",
     }
-    resp = requests.post(url, data=data, timeout=10)
+    resp = _HTTP.post(url, data=data, timeout=10)
     resp.raise_for_status()
     body = resp.json()
     access_token = body.get("access_token")
@@ -105,8 +122,9 @@ def resolve_roles_via_graph(user_oid: str, config: EntraConfig) -> list[str]:
     ``GroupMember.Read.All`` (or ``Directory.Read.All``).
 
     Returns a list of role strings (group display names). On Graph or
-    network errors, logs a warning and returns an empty list (no roles)
-    so the validator does not fail the request.
+    network errors, on any page, logs a warning and returns an empty list
+    (no roles) so the validator does not fail the request. A partial list
+    is never returned: it would look like a complete (and cacheable) answer.
     """
     if not config.client_secret or not user_oid:
         return []
@@ -120,25 +138,28 @@ def resolve_roles_via_graph(user_oid: str, config: EntraConfig) -> list[str]:
     headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
     url: str | None = f"{GRAPH_BASE}/users/{user_oid}/memberOf"
     roles: list[str] = []
+    append = roles.append
+    group_types = _GROUP_TYPES
 
     try:
         while url:
-            resp = requests.get(url, headers=headers, timeout=10)
+            resp = _HTTP.get(url, headers=headers, timeout=10)
             if resp.status_code != 200:
                 logger.warning("Graph memberOf returned status=%s", resp.status_code)
-                return roles  # return whatever we collected so far
-            body = resp.json()
+                return []
+            body = loads(resp.content)
 
-            for entry in body.get("value") or []:
-                odata_type = entry.get("@odata.type", "")
-                if odata_type not in _GROUP_TYPES:
-                    continue  # skip administrativeUnit, servicePrincipal, etc.
-                display_name = entry.get("displayName")
-                if display_name:
-                    roles.append(str(display_name))
+            for entry in body.get("value") or ():
+                # skip administrativeUnit, servicePrincipal, etc.
+                if entry.get(_ODATA_TYPE_KEY) in group_types:
+                    display_name = entry.get(_DISPLAY_NAME_KEY)
+                    # A non-string displayName is malformed; skip it rather than coerce it into a role.
+                    if display_name and isinstance(display_name, str):
+                        append(display_name)
 
             url = body.get("@odata.nextLink")  # None when no more pages
-    except requests.RequestException as e:
+    except (requests.RequestException, ValueError) as e:  # ValueError: body is not JSON
         logger.warning("Graph request failed: %s", type(e).__name__, exc_info=False)
+        return []
 
     return roles
@@ -12,19 +12,40 @@ Background for newcomers:
     added). If a token arrives signed with a key we haven't seen yet (the
     ``kid`` — Key ID — in the token header doesn't match anything in our
     cache), we force-refresh the cache once and try again before rejecting.
+
+    Keys are kept for the configured TTL, or less if the JWKS response's
+    ``Cache-Control: max-age`` is shorter. Once most of that time has passed,
+    the next lookup starts a background refresh, so requests rarely wait for
+    a fetch. If the endpoint is unreachable once they expire, the last good
+    keys can keep being served for ``max_stale_seconds`` (off by default).
 """
 
 from __future__ import annotations
 
 import logging
+import re
+import threading
 import time
 from typing import Any
 
 import requests
-from jwt import PyJWK
+from jwt import PyJWK, PyJWTError
+
+from ._json import loads
 
 logger = logging.getLogger(__name__)
 
+# Shared session so JWKS refreshes reuse a kept-alive connection.
+_HTTP = requests.Session()
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+# Fraction of the key lifetime after which a lookup triggers a background refresh.
+_REFRESH_AHEAD = 0.8
+
+# After a failed fetch, expired keys served as stale are not fetched again for this long.
+_STALE_RETRY_SECONDS = 30.0
+
 
 class JWKSCache:
     """
@@ -32,40 +53,112 @@ class JWKSCache:
 
     Fetches from the Entra discovery endpoint and caches for ``ttl_seconds``.
     On cache miss (unknown ``kid``), the cache is refreshed once to handle
-    Azure key rotation before returning None.
+    Azure key rotation before returning None. When a refresh fails, expired
+    keys are still used for up to ``max_stale_seconds``; past that the fetch
+    error is raised.
     """
 
-    def __init__(self, jwks_uri: str, ttl_seconds: int) -> None:
+    def __init__(self, jwks_uri: str, ttl_seconds: int, max_stale_seconds: int = 0) -> None:
         self._uri = jwks_uri
         self._ttl = ttl_seconds
-        self._data: dict[str, Any] | None = None
+        self._max_stale = max_stale_seconds
+        self._keys_by_kid: dict[str, PyJWK] | None = None
         self._fetched_at: float = 0.0
-
-    def _fetch(self) -> dict[str, Any]:
-        resp = requests.get(self._uri, timeout=10)
+        # Lifetime of the current key set: the TTL, capped by the response's max-age.
+        self._lifetime: float = ttl_seconds
+        # Validators from the last 200 response, sent back so an unchanged key set is a 304.
+        self._etag: str | None = None
+        self._last_modified: str | None = None
+        # No fetch before this monotonic time while serving stale keys after a failure.
+        self._retry_at: float = 0.0
+        # Serializes refreshes: concurrent callers that find the cache stale wait
+        # for the one in-flight fetch instead of each hitting the JWKS endpoint.
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._refreshing_lock = threading.Lock()
+
+    def _fetch(self) -> requests.Response:
+        headers = {}
+        if self._keys_by_kid is not None:
+            if self._etag:
+                headers["If-None-Match"] = self._etag
+            if self._last_modified:
+                headers["If-Modified-Since"] = self._last_modified
+        resp = _HTTP.get(self._uri, headers=headers, timeout=10)
         resp.raise_for_status()
-        return resp.json()
-
-    def _refresh(self) -> dict[str, Any]:
-        """Force-refresh the cache regardless of TTL."""
-        self._data = self._fetch()
+        return resp
+
+    def _refresh(self) -> dict[str, PyJWK]:
+        """Force-refresh the cache regardless of TTL. Caller must hold ``self._lock``."""
+        try:
+            resp = self._fetch()
+        except Exception:
+            self._retry_at = time.monotonic() + _STALE_RETRY_SECONDS
+            raise
+        if resp.status_code != 304:  # 304 Not Modified: keep (and re-time) the parsed keys
+            self._keys_by_kid = _parse_jwks(loads(resp.content))
+            self._etag = resp.headers.get("ETag")
+            self._last_modified = resp.headers.get("Last-Modified")
         self._fetched_at = time.monotonic()
-        logger.debug("JWKS cache refreshed uri=%s", self._uri)
-        return self._data
-
-    def _ensure_fresh(self) -> dict[str, Any]:
-        """Return cached data, refreshing only when TTL has elapsed."""
+        max_age = _max_age(resp.headers.get("Cache-Control"))
+        self._lifetime = self._ttl if max_age is None else min(self._ttl, max_age)
+        logger.debug("JWKS cache refreshed uri=%s lifetime=%ss", self._uri, self._lifetime)
+        return self._keys_by_kid
+
+    def _is_stale(self) -> bool:
+        if self._keys_by_kid is None:
+            return True
         now = time.monotonic()
-        if self._data is None or (now - self._fetched_at) >= self._ttl:
-            return self._refresh()
-        return self._data
+        age = now - self._fetched_at
+        if age < self._lifetime:
+            return False
+        # Expired keys are still served while a failed fetch waits to be retried, up to max_stale.
+        return now >= self._retry_at or age >= self._lifetime + self._max_stale
 
-    def _find_key(self, kid: str, data: dict[str, Any]) -> PyJWK | None:
-        """Look up a key by kid in the given JWKS data."""
-        for key_dict in data.get("keys") or []:
-            if key_dict.get("kid") == kid:
-                return PyJWK.from_dict(key_dict)
-        return None
+    def _refresh_due(self) -> bool:
+        now = time.monotonic()
+        return (
+            not self._refreshing
+            and now >= self._retry_at
+            and (now - self._fetched_at) >= _REFRESH_AHEAD * self._lifetime
+        )
+
+    def _refresh_in_background(self) -> None:
+        """Start one daemon refresh; callers keep using the current keys meanwhile."""
+        with self._refreshing_lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._background_refresh, name="jwks-refresh", daemon=True).start()
+
+    def _background_refresh(self) -> None:
+        try:
+            with self._lock:
+                self._refresh()
+        except Exception as e:
+            # Current keys stay in use; a lookup after they expire refreshes in the foreground.
+            logger.warning("JWKS background refresh failed uri=%s: %s", self._uri, type(e).__name__)
+        finally:
+            self._refreshing = False
+
+    def _ensure_fresh(self) -> dict[str, PyJWK]:
+        """Return cached keys, refreshing only when their lifetime has elapsed."""
+        if not self._is_stale():
+            if self._refresh_due():
+                self._refresh_in_background()
+            return self._keys_by_kid
+        with self._lock:
+            # Re-check: another thread may have refreshed while we waited.
+            if self._is_stale():
+                try:
+                    return self._refresh()
+                except Exception as e:
+                    if self._is_stale():
+                        raise
+                    logger.warning(
+                        "JWKS refresh failed uri=%s; serving stale keys: %s", self._uri, type(e).__name__
+                    )
+            return self._keys_by_kid
 
     def get_signing_key(self, kid: str) -> PyJWK | None:
         """
@@ -74,12 +167,39 @@ class JWKSCache:
         If ``kid`` is not in the cached key set, the cache is refreshed once
         (to handle Azure key rotation) before returning None.
         """
-        data = self._ensure_fresh()
-        key = self._find_key(kid, data)
+        keys = self._ensure_fresh()
+        key = keys.get(kid)
         if key is not None:
             return key
 
-        # Key not found — Azure may have rotated keys. Refresh once.
-        logger.info("kid not in cached JWKS; refreshing for possible key rotation")
-        data = self._refresh()
-        return self._find_key(kid, data)
+        # Key not found — Azure may have rotated keys. Refresh once, unless another
+        # thread already replaced the key set we looked in.
+        with self._lock:
+            if self._keys_by_kid is keys:
+                logger.info("kid not in cached JWKS; refreshing for possible key rotation")
+                self._refresh()
+            return self._keys_by_kid.get(kid)
+
+
+def _max_age(cache_control: str | None) -> int | None:
+    """Seconds from a ``Cache-Control: max-age=N`` header, or None when absent."""
+    match = _MAX_AGE_RE.search(cache_control) if cache_control else None
+    return int(match.group(1)) if match else None
+
+
+def _parse_jwks(data: dict[str, Any]) -> dict[str, PyJWK]:
+    """
+    Build ``kid -> PyJWK`` once per fetch, so lookups are a dict hit and the
+    RSA public key is not rebuilt on every token validation.
+    """
+    keys: dict[str, PyJWK] = {}
+    for key_dict in data.get("keys") or []:
+        kid = key_dict.get("kid")
+        if not kid:
+            continue
+        try:
+            keys[kid] = PyJWK.from_dict(key_dict)
+        except PyJWTError as e:
+            # One unusable key (e.g. unsupported type) must not hide the others.
+            logger.debug("Skipping JWKS key kid=%s: %s", kid, type(e).__name__)
+    return keys
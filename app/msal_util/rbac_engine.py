@@ -19,12 +19,21 @@ integration module can plug this into FastAPI dependencies or middleware.
 from __future__ import annotations
 
 from dataclasses import dataclass
+import functools
 import logging
+import operator
 from pathlib import Path
 import re
 from typing import Iterable, Mapping
 
-import yaml
+from .yaml_config import REGEX_META_RE, load_yaml
+
+# Route patterns are anchored and backtracking-free, so RE2's DFA (google-re2) can
+# match them in time linear in the path no matter how many rules are combined.
+try:
+    import re2 as _route_re
+except ImportError:
+    _route_re = re
 
 logger = logging.getLogger(__name__)
 
@@ -32,7 +41,7 @@ logger = logging.getLogger(__name__)
 # ---- Data structures -----------------------------------------------------------------
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RbacRule:
     """Single rule: which HTTP methods are allowed on a given path pattern."""
 
@@ -40,7 +49,7 @@ class RbacRule:
     methods: frozenset[str]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PermissionDef:
     """Permission definition loaded from YAML."""
 
@@ -49,7 +58,7 @@ class PermissionDef:
     public: bool = False
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RoleDef:
     """Role definition loaded from YAML (direct permissions and parent link)."""
 
@@ -60,7 +69,7 @@ class RoleDef:
     description: str | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RbacConfig:
     """Fully-loaded RBAC configuration."""
 
@@ -75,6 +84,10 @@ class RbacConfig:
 _PATH_PARAM_RE = re.compile(r"\{[^/]+\}")
 
 
+def _template_pattern(path_template: str) -> str:
+    return _PATH_PARAM_RE.sub(r"[^/]+", path_template)
+
+
 def _path_template_to_regex(path_template: str) -> re.Pattern[str]:
     """
     Convert a simple path template into a compiled regex.
@@ -83,14 +96,42 @@ def _path_template_to_regex(path_template: str) -> re.Pattern[str]:
         /content/{id}  ->  ^/content/[^/]+$
     """
 
-    regex = _PATH_PARAM_RE.sub(r"[^/]+", path_template)
-    return re.compile(rf"^{regex}$")
+    return _route_re.compile(rf"^{_template_pattern(path_template)}$")
+
+
+def _combined_regex(path_templates: Iterable[str]) -> re.Pattern[str]:
+    """
+    Compile several templates into one anchored alternation, one named group each.
+
+    ``match.lastgroup`` (``t<i>``) then identifies the first template (in order) that
+    matches; named groups keep that true when a template has capture groups of its own.
+    """
+
+    alternatives = "|".join(f"(?P<t{i}>{_template_pattern(t)})" for i, t in enumerate(path_templates))
+    return _route_re.compile(rf"^(?:{alternatives})$")
+
+
+def _could_overlap(a: str, b: str) -> bool:
+    """Conservative: can two path templates match the same concrete path?"""
+
+    if REGEX_META_RE.search(_PATH_PARAM_RE.sub("", a + b)):
+        return True  # regex syntax can span or vary segments; check the pair on every hit
+    segs_a, segs_b = a.split("/"), b.split("/")
+    if len(segs_a) != len(segs_b):
+        return False
+    return all(x == y or "{" in x or "{" in y for x, y in zip(segs_a, segs_b))
 
 
 def _normalize_methods(methods: Iterable[str]) -> frozenset[str]:
     return frozenset(m.upper() for m in methods)
 
 
+@functools.lru_cache(maxsize=256)
+def _display_names(names: frozenset[str]) -> str:
+    """Sorted, comma-joined names for debug logs; the same few role sets recur."""
+    return ",".join(sorted(names))
+
+
 # ---- Loader and inheritance resolution ----------------------------------------------
 
 
@@ -125,8 +166,11 @@ def load_rbac_config(path: Path) -> RbacConfig:
             methods: [GET]
     """
 
-    raw_text = path.read_text(encoding="utf-8")
-    raw = yaml.safe_load(raw_text) or {}
+    return _parse_rbac_config(load_yaml(path) or {})
+
+
+def _parse_rbac_config(raw: dict) -> RbacConfig:
+    """Validate the raw YAML mapping and build an RbacConfig."""
 
     roles_raw = raw.get("roles") or {}
     perms_raw = raw.get("permissions") or {}
@@ -139,8 +183,9 @@ def load_rbac_config(path: Path) -> RbacConfig:
     if not isinstance(public_raw, list):
         raise RbacConfigError("public must be a list when present")
 
-    # Parse permissions
+    # Parse permissions (rules of public: true permissions are collected as we go)
     permissions: dict[str, PermissionDef] = {}
+    public_perm_rules: list[RbacRule] = []
     for perm_name, perm_val in perms_raw.items():
         if not isinstance(perm_val, dict):
             raise RbacConfigError(f"permission {perm_name!r} must be a mapping")
@@ -166,6 +211,8 @@ def load_rbac_config(path: Path) -> RbacConfig:
             rules=tuple(rules),
             public=public_flag,
         )
+        if public_flag:
+            public_perm_rules.extend(rules)
 
     # Parse roles
     roles: dict[str, RoleDef] = {}
@@ -179,6 +226,10 @@ def load_rbac_config(path: Path) -> RbacConfig:
         if not isinstance(perms_list, list):
             raise RbacConfigError(f"role {role_name!r}.permissions must be a list when present")
         perms = frozenset(str(p) for p in perms_list)
+        # Permissions are already parsed, so unknown references fail right here.
+        unknown = [p for p in perms if p not in permissions]
+        if unknown:
+            raise RbacConfigError(f"role {role_name!r} references unknown permissions: {sorted(unknown)}")
         display_name = role_val.get("display_name")
         description = role_val.get("description") or role_val.get("Description")
 
@@ -190,17 +241,11 @@ def load_rbac_config(path: Path) -> RbacConfig:
             description=str(description) if description is not None else None,
         )
 
-    # Validate extends targets exist
+    # Validate extends targets exist (needs all roles: a role may extend one defined later)
     for role in roles.values():
         if role.extends and role.extends not in roles:
             raise RbacConfigError(f"role {role.name!r} extends unknown role {role.extends!r}")
 
-    # Validate that permissions referenced by roles exist
-    for role in roles.values():
-        unknown = role.permissions.difference(permissions.keys())
-        if unknown:
-            raise RbacConfigError(f"role {role.name!r} references unknown permissions: {sorted(unknown)}")
-
     # Compute public rules (from top-level public section)
     public_rules: list[RbacRule] = []
     for entry in public_raw:
@@ -215,9 +260,7 @@ def load_rbac_config(path: Path) -> RbacConfig:
         public_rules.append(RbacRule(path_template=path_template, methods=_normalize_methods(methods_raw)))
 
     # Also treat any permission with public: true as contributing public rules
-    for perm in permissions.values():
-        if perm.public:
-            public_rules.extend(perm.rules)
+    public_rules.extend(public_perm_rules)
 
     return RbacConfig(
         roles=roles,
@@ -230,37 +273,72 @@ def _compute_effective_permissions(config: RbacConfig) -> dict[str, frozenset[st
     """
     Resolve role inheritance and compute effective permissions per role.
 
-    Detect cycles in extends and raise RbacConfigError if found.
+    Roles are visited in topological order (Kahn's algorithm), so each parent is
+    resolved before its children. Roles never reached sit on or below a cycle in
+    extends, and RbacConfigError is raised.
     """
 
-    effective: dict[str, frozenset[str]] = {}
-    visiting: set[str] = set()
-
-    def dfs(role_name: str) -> frozenset[str]:
-        if role_name in effective:
-            return effective[role_name]
-        if role_name in visiting:
-            raise RbacConfigError(f"cycle detected in role inheritance at {role_name!r}")
-        visiting.add(role_name)
-        role = config.roles[role_name]
-        perms = set(role.permissions)
+    roles = config.roles
+    children: dict[str, list[str]] = {name: [] for name in roles}
+    order: list[str] = []
+    for role in roles.values():
         if role.extends:
-            parent_perms = dfs(role.extends)
-            perms.update(parent_perms)
-        result = frozenset(perms)
-        effective[role_name] = result
-        visiting.remove(role_name)
-        return result
+            children[role.extends].append(role.name)
+        else:
+            order.append(role.name)
 
-    for name in config.roles.keys():
-        dfs(name)
+    # Single inheritance: a role's only incoming edge is its parent, so it is ready
+    # as soon as the parent is. The list doubles as the queue.
+    for name in order:
+        order.extend(children[name])
 
-    return effective
+    if len(order) != len(roles):
+        unresolved = sorted(set(roles).difference(order))
+        raise RbacConfigError(f"cycle detected in role inheritance among roles {unresolved}")
+
+    effective: dict[str, frozenset[str]] = {}
+    for name in order:
+        role = roles[name]
+        effective[name] = role.permissions | effective[role.extends] if role.extends else role.permissions
+
+    return {name: effective[name] for name in roles}
 
 
 # ---- RBAC engine ---------------------------------------------------------------------
 
 
+class _MethodRoutes:
+    """
+    Every permission rule for one HTTP method, matched with a single combined regex.
+
+    Templates shared by several permissions are merged into one alternative, carrying
+    the OR of their permission bits. Since an alternation stops at the first template
+    that matches, later templates that could match the same path are recorded up front
+    and checked individually on a hit.
+    """
+
+    def __init__(self, mask_by_template: Mapping[str, int]) -> None:
+        templates = list(mask_by_template)
+        self._regex = _combined_regex(templates)
+        self._masks = list(mask_by_template.values())
+        self._patterns = [_path_template_to_regex(t) for t in templates]
+        self._overlaps = [
+            tuple(j for j in range(i + 1, len(templates)) if _could_overlap(t, templates[j]))
+            for i, t in enumerate(templates)
+        ]
+
+    def required_mask(self, path: str) -> int:
+        m = self._regex.match(path)
+        if m is None:
+            return 0
+        i = int(m.lastgroup[1:])
+        mask = self._masks[i]
+        for j in self._overlaps[i]:
+            if self._patterns[j].match(path):
+                mask |= self._masks[j]
+        return mask
+
+
 class RbacEngine:
     """
     In-memory RBAC engine built from a validated RbacConfig.
@@ -279,19 +357,51 @@ class RbacEngine:
         self._config = config
         self._effective_permissions = dict(effective_permissions)
 
-        # Compile path patterns to regexes for faster matching
-        self._public_patterns = [
-            (_path_template_to_regex(rule.path_template), rule.methods) for rule in config.public_rules
-        ]
-
-        # Precompute permission → list of (regex, methods)
-        perm_routes: dict[str, list[tuple[re.Pattern[str], frozenset[str]]]] = {}
+        # Permission sets are int bitmasks internally: union / intersection is one int op.
+        self._perm_names = list(config.permissions)
+        perm_bits = {name: 1 << i for i, name in enumerate(self._perm_names)}
+        self._role_masks = {
+            role: functools.reduce(operator.or_, (perm_bits[p] for p in perms), 0)
+            for role, perms in self._effective_permissions.items()
+        }
+        # Debug-log text per permission mask, memoized; every role's mask is rendered up front.
+        self._mask_display = functools.lru_cache(maxsize=256)(self._render_mask)
+        for mask in self._role_masks.values():
+            self._mask_display(mask)
+
+        # Literal paths (most rules) are dict/set lookups; only templated paths need regexes.
+        public_literals: set[tuple[str, str]] = set()
+        public_by_method: dict[str, dict[str, None]] = {}
+        for rule in config.public_rules:
+            is_literal = REGEX_META_RE.search(rule.path_template) is None
+            for method in rule.methods:
+                if is_literal:
+                    public_literals.add((method, rule.path_template))
+                else:
+                    public_by_method.setdefault(method, {})[rule.path_template] = None
+        self._public_literals = frozenset(public_literals)
+        self._public_regex = {method: _combined_regex(ts) for method, ts in public_by_method.items()}
+
+        # Precompute (method, literal path) → permission mask, and method → template → mask
+        self._literal_masks: dict[tuple[str, str], int] = {}
+        masks_by_method: dict[str, dict[str, int]] = {}
         for perm_name, perm in config.permissions.items():
-            routes: list[tuple[re.Pattern[str], frozenset[str]]] = []
+            bit = perm_bits[perm_name]
             for rule in perm.rules:
-                routes.append((_path_template_to_regex(rule.path_template), rule.methods))
-            perm_routes[perm_name] = routes
-        self._perm_routes = perm_routes
+                is_literal = REGEX_META_RE.search(rule.path_template) is None
+                for method in rule.methods:
+                    if is_literal:
+                        key = (method, rule.path_template)
+                        self._literal_masks[key] = self._literal_masks.get(key, 0) | bit
+                    else:
+                        by_template = masks_by_method.setdefault(method, {})
+                        by_template[rule.path_template] = by_template.get(rule.path_template, 0) | bit
+        self._perm_routes = {method: _MethodRoutes(by_template) for method, by_template in masks_by_method.items()}
+
+        # Decisions are pure functions of the config and their arguments, so memoize them.
+        # Bounded because concrete paths (/content/123) are unbounded.
+        self._is_public_cached = functools.lru_cache(maxsize=4096)(self._is_public_uncached)
+        self._is_allowed_cached = functools.lru_cache(maxsize=4096)(self._is_allowed_uncached)
 
     @classmethod
     def from_yaml(cls, path: Path) -> RbacEngine:
@@ -311,34 +421,35 @@ class RbacEngine:
 
     # ---- Matching helpers -----------------------------------------------------------
 
-    def _matches_any(
-        self,
-        patterns: list[tuple[re.Pattern[str], frozenset[str]]],
-        method: str,
-        path: str,
-    ) -> bool:
-        method = method.upper()
-        for regex, methods in patterns:
-            if method in methods and regex.match(path):
-                return True
-        return False
+    def _required_permissions_for(self, method: str, path: str) -> int:
+        """Return the bitmask of permissions whose rules match (method, path). ``method`` must be uppercase."""
+        required = self._literal_masks.get((method, path), 0)
+        routes = self._perm_routes.get(method)
+        if routes is not None:
+            # A literal path can also match a template (/content/new vs /content/{id}).
+            required |= routes.required_mask(path)
+        return required
 
-    def _required_permissions_for(self, method: str, path: str) -> frozenset[str]:
-        """Return set of permission names whose rules match (method, path)."""
-        method = method.upper()
-        required: set[str] = set()
-        for perm_name, routes in self._perm_routes.items():
-            for regex, methods in routes:
-                if method in methods and regex.match(path):
-                    required.add(perm_name)
-                    break
-        return frozenset(required)
+    def _render_mask(self, mask: int) -> str:
+        """Decode a permission bitmask to sorted, comma-joined names (for logging)."""
+        return ",".join(sorted(name for i, name in enumerate(self._perm_names) if mask >> i & 1))
 
     # ---- Public vs RBAC-protected ---------------------------------------------------
 
     def is_public(self, method: str, path: str) -> bool:
         """Return True if (method, path) is marked as public in config."""
-        return self._matches_any(self._public_patterns, method, path)
+        return self._is_public_cached(method.upper(), path)
+
+    def _is_public_uncached(self, method: str, path: str) -> bool:
+        if (method, path) in self._public_literals:
+            return True
+        regex = self._public_regex.get(method)
+        return regex is not None and regex.match(path) is not None
+
+    def invalidate(self) -> None:
+        """Drop memoized decisions (call after changing anything the engine was built from)."""
+        self._is_public_cached.cache_clear()
+        self._is_allowed_cached.cache_clear()
 
     # ---- Main decision API ----------------------------------------------------------
 
@@ -353,49 +464,66 @@ class RbacEngine:
         4. If intersection is non-empty -> allow, else deny.
 
         Unknown roles are ignored (treated as having no permissions).
+        Results are memoized per (roles, method, path); with debug logging on, every
+        decision is logged, cached or not.
         """
 
-        if self.is_public(method, path):
+        roles = frozenset(user_roles)
+        method = method.upper()
+        allowed = self._is_allowed_cached(roles, method, path)
+        if logger.isEnabledFor(logging.DEBUG):
+            self._log_decision(roles, method, path)
+        return allowed
+
+    def _user_mask(self, user_roles: frozenset[str]) -> int:
+        if len(user_roles) == 1:
+            # Common case: a single role's mask is used as-is.
+            (role,) = user_roles
+            return self._role_masks.get(role, 0)
+        user_mask = 0
+        for role in user_roles:
+            user_mask |= self._role_masks.get(role, 0)
+        return user_mask
+
+    def _is_allowed_uncached(self, user_roles: frozenset[str], method: str, path: str) -> bool:
+        # ``method`` was uppercased once by is_allowed; internal helpers trust it.
+        if self._is_public_cached(method, path):
             return True
+        # No rule defined -> required mask is 0 -> fail closed; config should be explicit.
+        return bool(self._user_mask(user_roles) & self._required_permissions_for(method, path))
 
-        required_perms = self._required_permissions_for(method, path)
-        if not required_perms:
-            # No rule defined -> fail closed; config should be explicit.
-            logger.debug("RBAC: no matching rules for method=%s path=%s", method, path)
-            return False
+    def _log_decision(self, user_roles: frozenset[str], method: str, path: str) -> None:
+        """Debug-log why (method, path) was allowed or denied; recomputes the masks."""
+        if self._is_public_cached(method, path):
+            return
 
-        user_perms: set[str] = set()
-        for role in user_roles:
-            eff = self._effective_permissions.get(role)
-            if eff:
-                user_perms.update(eff)
+        required_mask = self._required_permissions_for(method, path)
+        if not required_mask:
+            logger.debug("RBAC: no matching rules for method=%s path=%s", method, path)
+            return
 
-        if not user_perms:
+        user_mask = self._user_mask(user_roles)
+        if not user_mask:
             logger.debug(
                 "RBAC: user has no effective permissions roles=%s method=%s path=%s",
-                sorted(user_roles),
+                _display_names(user_roles),
                 method,
                 path,
             )
-            return False
-
-        if user_perms & required_perms:
+        elif user_mask & required_mask:
             logger.debug(
                 "RBAC: allowed roles=%s method=%s path=%s perms=%s",
-                sorted(user_roles),
+                _display_names(user_roles),
                 method,
                 path,
-                sorted(user_perms & required_perms),
+                self._mask_display(user_mask & required_mask),
+            )
+        else:
+            logger.debug(
+                "RBAC: denied roles=%s method=%s path=%s required_perms=%s user_perms=%s",
+                _display_names(user_roles),
+                method,
+                path,
+                self._mask_display(required_mask),
+                self._mask_display(user_mask),
             )
-            return True
-
-        logger.debug(
-            "RBAC: denied roles=%s method=%s path=%s required_perms=%s user_perms=%s",
-            sorted(user_roles),
-            method,
-            path,
-            sorted(required_perms),
-            sorted(user_perms),
-        )
-        return False
-
@@ -18,11 +18,23 @@ Background for newcomers:
 
 from __future__ import annotations
 
+import base64
+from collections import OrderedDict
+from functools import lru_cache
+import hashlib
 import logging
+import threading
+import time
 from typing import Any
 
 import jwt
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import padding
+from cryptography.hazmat.primitives.asymmetric.rsa import RSAPublicKey
+from jwt.exceptions import InvalidJTIError, InvalidSubjectError
 
+from ._json import loads
 from .config import EntraConfig
 from .context import TokenContext
 from .graph_client import resolve_roles_via_graph
@@ -30,6 +42,32 @@ from .jwks_cache import JWKSCache
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on remembered verified tokens per validator (LRU beyond that).
+_VERIFIED_CACHE_SIZE = 4096
+
+# Rejected tokens are remembered briefly, so a client replaying a bad token skips JWKS and RSA.
+_REJECTED_CACHE_SIZE = 4096
+_REJECTED_TTL_SECONDS = 60.0
+
+_ALGORITHMS = frozenset(("RS256",))
+
+# One decoder with our options baked in, so decode() skips merging an options dict per call.
+_JWT = jwt.PyJWT(
+    options={
+        "verify_signature": True,
+        "verify_exp": True,
+        "verify_nbf": True,
+        "verify_iss": True,
+        "verify_aud": True,
+    }
+)
+
+
+# RS256 = RSASSA-PKCS1-v1_5 with SHA-256; shared by every direct verify. The digest runs
+# inside OpenSSL (SHA-NI where the CPU has it) over the signing input sliced from the token.
+_PKCS1V15 = padding.PKCS1v15()
+_SHA256 = hashes.SHA256()
+
 
 class ValidationError(Exception):
     """Raised when token validation fails. Do not log the token."""
@@ -37,16 +75,43 @@ class ValidationError(Exception):
     pass
 
 
-def _get_kid(token: str) -> str | None:
+class _RetryableValidationError(ValidationError):
+    """A rejection the same token may pass later (not yet valid, key not yet known); never remembered."""
+
+
+def _get_header(token: str) -> dict[str, Any] | None:
     """
-    Read the ``kid`` (Key ID) from the JWT header **without** validating the
-    token. We need the kid to look up the correct public key in the JWKS.
+    Read the JWT header **without** validating the token. We need its ``kid``
+    (Key ID) to look up the correct public key in the JWKS.
+
+    Decodes just the Base64URL header segment, once per token: the fast verify
+    path reuses it, and ``_JWT.decode`` validates the full header anyway.
     """
     try:
-        header = jwt.get_unverified_header(token)
-        return header.get("kid") if isinstance(header, dict) else None
-    except Exception:
+        header = loads(_b64url_decode(token.partition(".")[0]))
+    except (ValueError, RecursionError):  # RecursionError: deeply nested JSON, stdlib parser
         return None
+    return header if isinstance(header, dict) else None
+
+
+def _peek_exp(token: str) -> float | None:
+    """
+    Read the ``exp`` claim **without** verifying the signature. Only a hint for
+    rejecting expired tokens before JWKS and RSA; ``exp`` is checked again after
+    verification.
+    """
+    try:
+        payload = loads(_b64url_decode(token.partition(".")[2].partition(".")[0]))
+    except (ValueError, RecursionError):
+        return None
+    exp = payload.get("exp") if isinstance(payload, dict) else None
+    if isinstance(exp, bool) or not isinstance(exp, (int, float)):
+        return None
+    return exp
+
+
+def _b64url_decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
 
 
 def _extract_claims(payload: dict[str, Any]) -> TokenContext:
@@ -71,37 +136,41 @@ def _extract_claims(payload: dict[str, Any]) -> TokenContext:
       only; do not use for authorization.
     """
 
+    get = payload.get
+
     # Prefer oid (stable, tenant-wide) over sub (pairwise, per-app).
-    user_id = payload.get("oid") or payload.get("sub") or ""
+    user_id = get("oid") or get("sub") or ""
     user_id = str(int(user_id)) if isinstance(user_id, (int, float)) else str(user_id)
 
-    roles: list[str] = []
-    raw_roles = payload.get("roles")
+    raw_roles = get("roles")
     if isinstance(raw_roles, list):
-        roles = [str(r) for r in raw_roles]
+        roles = tuple(map(str, raw_roles))
     elif isinstance(raw_roles, str):
-        roles = [raw_roles]
+        roles = (raw_roles,)
+    else:
+        roles = ()
 
-    department: str | None = None
-    if "department" in payload and payload["department"]:
-        department = str(payload["department"])
+    department = get("department")
+    department = str(department) if department else None
 
-    scopes: list[str] = []
-    scp = payload.get("scp")
+    # str.split() with no separator already drops empty and whitespace-only parts.
+    scp = get("scp")
     if isinstance(scp, str):
-        scopes = [s.strip() for s in scp.split() if s.strip()]
+        scopes = tuple(scp.split())
     elif isinstance(scp, list):
-        scopes = [str(s) for s in scp]
+        scopes = tuple(map(str, scp))
+    else:
+        scopes = ()
 
-    preferred_username = payload.get("preferred_username")
+    preferred_username = get("preferred_username")
     if preferred_username is not None:
         preferred_username = str(preferred_username)
 
     return TokenContext(
         user_id=user_id,
-        roles=tuple(roles),
+        roles=roles,
         department=department,
-        scopes=tuple(scopes),
+        scopes=scopes,
         preferred_username=preferred_username,
     )
 
@@ -119,7 +188,127 @@ class EntraTokenValidator:
         self._jwks = JWKSCache(
             self._config.jwks_uri,
             self._config.jwks_cache_ttl_seconds,
+            self._config.jwks_max_stale_seconds,
         )
+        # Fixed per config; resolved once instead of on every jwt.decode call.
+        self._issuer = self._config.issuer
+        self._audience = self._config.expected_audience
+        self._leeway = self._config.clock_skew_seconds
+        self._fast_verify = self._config.fast_verify
+        # Verified tokens until their exp: a repeat token skips the RS256 verify (and Graph).
+        # Keyed by a digest so the cache never holds the bearer tokens themselves.
+        self._verified: OrderedDict[bytes, tuple[float, TokenContext]] = OrderedDict()
+        self._rejected: OrderedDict[bytes, tuple[float, str]] = OrderedDict()
+        self._verified_lock = threading.Lock()
+
+    def _cached_context(self, key: bytes) -> TokenContext | None:
+        with self._verified_lock:
+            entry = self._verified.get(key)
+            if entry is None:
+                return None
+            exp, ctx = entry
+            if time.time() >= exp:
+                del self._verified[key]
+                return None
+            self._verified.move_to_end(key)
+            return ctx
+
+    def _remember(self, key: bytes, exp: float, ctx: TokenContext) -> None:
+        with self._verified_lock:
+            self._verified[key] = (exp, ctx)
+            self._verified.move_to_end(key)
+            if len(self._verified) > _VERIFIED_CACHE_SIZE:
+                self._verified.popitem(last=False)
+
+    def _cached_rejection(self, key: bytes) -> str | None:
+        with self._verified_lock:
+            entry = self._rejected.get(key)
+            if entry is None:
+                return None
+            until, message = entry
+            if time.time() >= until:
+                del self._rejected[key]
+                return None
+            return message
+
+    def _remember_rejection(self, key: bytes, message: str) -> None:
+        with self._verified_lock:
+            self._rejected[key] = (time.time() + _REJECTED_TTL_SECONDS, message)
+            self._rejected.move_to_end(key)
+            if len(self._rejected) > _REJECTED_CACHE_SIZE:
+                self._rejected.popitem(last=False)
+
+    def _fast_decode(self, token: str, key: Any, header: dict[str, Any]) -> dict[str, Any]:
+        """
+        RS256 verify straight through ``cryptography``, then the same claim checks
+        ``_JWT.decode`` runs. ``header`` is the already-decoded first segment.
+        Failures raise the matching ``jwt`` exceptions, so callers handle both
+        paths alike.
+        """
+        if token.count(".") != 2:
+            raise jwt.DecodeError("Not enough segments")
+        signing_input, _, signature_b64 = token.rpartition(".")
+        payload_b64 = signing_input.partition(".")[2]
+        try:
+            payload = loads(_b64url_decode(payload_b64))
+            signature = _b64url_decode(signature_b64)
+        except (ValueError, RecursionError) as e:
+            raise jwt.DecodeError("Invalid token encoding") from e
+        if not isinstance(payload, dict):
+            raise jwt.DecodeError("Invalid token encoding")
+        if header.get("alg") not in _ALGORITHMS:
+            raise jwt.InvalidAlgorithmError("The specified alg value is not allowed")
+        if not isinstance(key, RSAPublicKey):
+            raise jwt.InvalidSignatureError("Signing key is not an RSA key")
+        try:
+            key.verify(signature, signing_input.encode(), _PKCS1V15, _SHA256)
+        except InvalidSignature as e:
+            raise jwt.InvalidSignatureError("Signature verification failed") from e
+
+        now = time.time()
+        leeway = self._leeway
+        try:
+            if "iat" in payload and int(payload["iat"]) > now + leeway:
+                raise jwt.ImmatureSignatureError("The token is not yet valid (iat)")
+        except (TypeError, ValueError):
+            raise jwt.InvalidIssuedAtError("Issued At claim (iat) must be an integer.") from None
+        try:
+            if "nbf" in payload and int(payload["nbf"]) > now + leeway:
+                raise jwt.ImmatureSignatureError("The token is not yet valid (nbf)")
+            if "exp" in payload and int(payload["exp"]) <= now - leeway:
+                raise jwt.ExpiredSignatureError("Signature has expired")
+        except (TypeError, ValueError):
+            raise jwt.DecodeError("Lifetime claims (nbf, exp) must be integers.") from None
+
+        if "iss" not in payload:
+            raise jwt.MissingRequiredClaimError("iss")
+        if payload["iss"] != self._issuer:
+            raise jwt.InvalidIssuerError("Invalid issuer")
+
+        aud = payload.get("aud")
+        if not aud:
+            raise jwt.MissingRequiredClaimError("aud")
+        if isinstance(aud, str):
+            # Entra access tokens carry a single audience string: one compare, no list.
+            if aud != self._audience:
+                raise jwt.InvalidAudienceError("Audience doesn't match")
+        else:
+            if not isinstance(aud, list) or any(not isinstance(a, str) for a in aud):
+                raise jwt.InvalidAudienceError("Invalid claim format in token")
+            if self._audience not in aud:
+                raise jwt.InvalidAudienceError("Audience doesn't match")
+
+        if "sub" in payload and not isinstance(payload["sub"], str):
+            raise InvalidSubjectError("Subject must be a string")
+        if "jti" in payload and not isinstance(payload["jti"], str):
+            raise InvalidJTIError("JWT ID must be a string")
+        return payload
+
+    def cache_clear(self) -> None:
+        """Forget every verified and rejected token, e.g. after revoking a user's access."""
+        with self._verified_lock:
+            self._verified.clear()
+            self._rejected.clear()
 
     def validate_and_extract(self, token: str) -> TokenContext:
         """
@@ -127,39 +316,61 @@ class EntraTokenValidator:
 
         This is the instance method that does the real work. There is also a
         module-level function ``validate_and_extract(token, config=...)`` in
-        this file that creates a validator and calls this method — use that
+        this file that reuses a shared validator and calls this method — use that
         when you want a one-liner without holding a validator instance (e.g.
         config from environment). Use this method when you already have an
         ``EntraTokenValidator`` (e.g. for tests or when reusing one instance).
         Raises ValidationError if signature, issuer, audience, or lifetime
-        checks fail.
+        checks fail. A token that already validated is served from cache
+        until its ``exp``; one that was rejected for good (bad signature,
+        issuer or audience, malformed, expired) keeps failing with the same
+        error for a minute without being checked again.
         """
-        kid = _get_kid(token)
-        if not kid:
+        cache_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+        cached = self._cached_context(cache_key)
+        if cached is not None:
+            return cached
+        rejection = self._cached_rejection(cache_key)
+        if rejection is not None:
+            raise ValidationError(rejection)
+
+        try:
+            return self._validate(token, cache_key)
+        except _RetryableValidationError:
+            raise
+        except ValidationError as e:
+            self._remember_rejection(cache_key, str(e))
+            raise
+
+    def _validate(self, token: str, cache_key: bytes) -> TokenContext:
+        header = _get_header(token)
+        kid = header.get("kid") if header else None
+        if not kid or not isinstance(kid, str):
             logger.debug("Token missing or invalid kid")
             raise ValidationError("Invalid token: missing key id")
 
+        exp = _peek_exp(token)
+        if exp is not None and exp <= time.time() - self._leeway:
+            logger.info("Token expired")
+            raise ValidationError("Token expired")
+
         signing_key = self._jwks.get_signing_key(kid)
         if signing_key is None:
             logger.debug("No signing key found for kid")
-            raise ValidationError("Invalid token: unknown signing key")
+            raise _RetryableValidationError("Invalid token: unknown signing key")
 
         try:
-            payload = jwt.decode(
-                token,
-                signing_key.key,
-                algorithms=["RS256"],
-                audience=self._config.expected_audience,
-                issuer=self._config.issuer,
-                leeway=self._config.clock_skew_seconds,
-                options={
-                    "verify_signature": True,
-                    "verify_exp": True,
-                    "verify_nbf": True,
-                    "verify_iss": True,
-                    "verify_aud": True,
-                },
-            )
+            if self._fast_verify:
+                payload = self._fast_decode(token, signing_key.key, header)
+            else:
+                payload = _JWT.decode(
+                    token,
+                    signing_key.key,
+                    algorithms=_ALGORITHMS,
+                    audience=self._audience,
+                    issuer=self._issuer,
+                    leeway=self._leeway,
+                )
         except jwt.ExpiredSignatureError as e:
             logger.info("Token expired")
             raise ValidationError("Token expired") from e
@@ -169,11 +380,15 @@ class EntraTokenValidator:
         except jwt.InvalidAudienceError as e:
             logger.info("Token invalid audience")
             raise ValidationError("Invalid token: audience") from e
+        except jwt.ImmatureSignatureError as e:
+            logger.info("Token invalid: %s", type(e).__name__)
+            raise _RetryableValidationError("Invalid token") from e
         except jwt.InvalidTokenError as e:
             logger.info("Token invalid: %s", type(e).__name__)
             raise ValidationError("Invalid token") from e
 
         ctx = _extract_claims(payload)
+        cacheable = "exp" in payload
 
         # Optional: resolve roles via Microsoft Graph when not in token
         if not ctx.roles and self._config.graph_enabled:
@@ -188,18 +403,42 @@ class EntraTokenValidator:
                         scopes=ctx.scopes,
                         preferred_username=ctx.preferred_username,
                     )
+                else:
+                    cacheable = False  # Graph failed (on any page) or found nothing; retry next time
+
+        if cacheable:
+            self._remember(cache_key, float(payload["exp"]), ctx)
         return ctx
 
 
+_default_validator: EntraTokenValidator | None = None
+_default_validator_lock = threading.Lock()
+
+
+def _get_default_validator() -> EntraTokenValidator:
+    """Validator for config from the environment, built once on first use."""
+    global _default_validator
+    if _default_validator is None:
+        with _default_validator_lock:
+            if _default_validator is None:
+                _default_validator = EntraTokenValidator()
+    return _default_validator
+
+
+@lru_cache(maxsize=4)
+def _validator_for(config: EntraConfig) -> EntraTokenValidator:
+    return EntraTokenValidator(config=config)
+
+
 def validate_and_extract(token: str, config: EntraConfig | None = None) -> TokenContext:
     """
     Convenience function: validate bearer token and return TokenContext.
 
-    Creates an ``EntraTokenValidator`` (loading config from the environment
-    if ``config`` is None) and delegates to its ``validate_and_extract``
-    instance method. Prefer this when you need a single call without
-    managing a validator instance; use ``EntraTokenValidator`` directly
-    when you want to reuse one validator (and its JWKS cache) for many tokens.
+    Delegates to a shared ``EntraTokenValidator`` so the JWKS cache survives
+    across calls: one built from the environment (read once, on first call)
+    when ``config`` is None, otherwise one per distinct ``config``. Prefer this
+    when you need a single call without managing a validator instance; use
+    ``EntraTokenValidator`` directly when you want full control of its lifetime.
     """
-    validator = EntraTokenValidator(config=config)
+    validator = _get_default_validator() if config is None else _validator_for(config)
     return validator.validate_and_extract(token)
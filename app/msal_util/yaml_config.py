@@ -0,0 +1,27 @@
+"""
+YAML config helpers shared by the RBAC engine (rbac_engine.py) and the
+security rules (app/security/config.py).
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+import re
+from typing import Any
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
+
+# Path templates (or segments) without parameters or regex syntax only ever match themselves.
+REGEX_META_RE = re.compile(r"[.^$*+?{}\[\]\\|()]")
+
+
+def load_yaml(path: Path) -> Any:
+    """Parse a YAML file; the loader gets the byte stream and decodes while scanning."""
+
+    with path.open("rb") as f:
+        return yaml.load(f, Loader=_YamlLoader)
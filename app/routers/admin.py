@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from fastapi import APIRouter, Depends
 from sqlalchemy import select
-from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.orm import Session, joinedload, selectinload
 
 from app.db.session import get_db
 from app.models.security import Role, User
@@ -13,6 +13,6 @@ router = APIRouter(prefix="/admin", tags=["admin"])
 
 @router.get("/users", response_model=list[UserOut])
 def list_users(db: Session = Depends(get_db)) -> list[User]:
-    stmt = select(User).options(selectinload(User.department), selectinload(User.roles)).order_by(User.id)
-    return list(db.scalars(stmt).all())
+    stmt = select(User).options(joinedload(User.department), selectinload(User.roles)).order_by(User.id)
+    return db.scalars(stmt).all()
 
@@ -17,12 +17,12 @@ router = APIRouter(prefix="/decorator-demo", tags=["decorator_demo"])
 @filter_by_department()
 def decorator_scoped_employees(db: Session = Depends(get_db)) -> list[Employee]:
     # No config entry required: decorators provide rule metadata, enforced globally.
-    return list(db.scalars(select(Employee).order_by(Employee.id)).all())
+    return db.scalars(select(Employee).order_by(Employee.id)).all()
 
 
 @router.get("/performance-reviews", response_model=list[PerformanceReviewOut])
 @require_roles(["hr_manager", "admin"])
 @require_sensitive_permission()
 def decorator_sensitive_reviews(db: Session = Depends(get_db)) -> list[PerformanceReview]:
-    return list(db.scalars(select(PerformanceReview).order_by(PerformanceReview.id)).all())
+    return db.scalars(select(PerformanceReview).order_by(PerformanceReview.id)).all()
 
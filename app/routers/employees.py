@@ -21,11 +21,12 @@ def me(user=Depends(get_current_user)) -> UserOut:
 @router.get("/employees", response_model=list[EmployeeOut])
 def list_employees(db: Session = Depends(get_db)) -> list[Employee]:
     # Filters are applied transparently via app/db/filters.py based on request authz.
-    return list(db.scalars(select(Employee).order_by(Employee.id)).all())
+    return db.scalars(select(Employee).order_by(Employee.id)).all()
 
 
 @router.get("/employees/{id}", response_model=EmployeeOut)
 def get_employee(id: int, db: Session = Depends(get_db)) -> Employee:
+    # Always a SELECT (not db.get): an identity-map hit would skip the authz filters.
     employee = db.scalars(select(Employee).where(Employee.id == id)).first()
     if employee is None:
         # If an employee is outside your department or sensitive rows are hidden,
@@ -13,5 +13,5 @@ router = APIRouter(tags=["performance_reviews"])
 
 @router.get("/performance-reviews", response_model=list[PerformanceReviewOut])
 def list_performance_reviews(db: Session = Depends(get_db)) -> list[PerformanceReview]:
-    return list(db.scalars(select(PerformanceReview).order_by(PerformanceReview.id)).all())
+    return db.scalars(select(PerformanceReview).order_by(PerformanceReview.id)).all()
 
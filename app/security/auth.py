@@ -4,7 +4,7 @@ import logging
 
 from fastapi import HTTPException, Request, status
 from sqlalchemy import select
-from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.orm import Session, joinedload, selectinload
 
 from app.models.security import User
 from app.security.config import SecurityConfig
@@ -21,34 +21,41 @@ def extract_user_id(request: Request, config: SecurityConfig) -> int | None:
     - Production behavior (documented only): validate token + resolve roles via Azure AD
     """
 
-    header_name = config.auth.authorization_header
-    bearer_prefix = config.auth.bearer_prefix
+    scope = request.scope
+    path = scope["path"]
+    method = scope["method"]
 
-    raw = request.headers.get(header_name)
+    # Scan the raw ASGI headers instead of building request.headers for a single lookup.
+    header_key = config.authorization_header_key
+    raw = next((value.decode("latin-1") for key, value in scope["headers"] if key == header_key), None)
     if not raw:
-        logger.info("Missing Authorization header (auth required) path=%s method=%s", request.url.path, request.method)
+        logger.info("Missing Authorization header (auth required) path=%s method=%s", path, method)
         return None
 
-    prefix = f"{bearer_prefix} "
+    prefix = config.bearer_token_prefix
     if not raw.startswith(prefix):
-        logger.warning("Invalid Authorization header format path=%s method=%s", request.url.path, request.method)
+        logger.warning("Invalid Authorization header format path=%s method=%s", path, method)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid {header_name}. Expected '{bearer_prefix} <token>'.",
+            detail=config.invalid_header_detail,
         )
 
     token = raw[len(prefix) :].strip()
     if not token:
-        logger.warning("Empty bearer token path=%s method=%s", request.url.path, request.method)
+        logger.warning("Empty bearer token path=%s method=%s", path, method)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid {header_name}. Missing token after '{bearer_prefix}'.",
+            detail=config.missing_token_detail,
         )
 
+    # ASCII digits only: rejects signs, underscores and non-ASCII digits. int() can still
+    # raise ValueError past the interpreter's digit limit (4300 by default).
     try:
+        if not (token.isascii() and token.isdigit()):
+            raise ValueError(token)
         return int(token)
     except ValueError as exc:  # pragma: no cover (simple demo)
-        logger.warning("Bearer token not an int (demo expects user_id) path=%s method=%s", request.url.path, request.method)
+        logger.warning("Bearer token not an int (demo expects user_id) path=%s method=%s", path, method)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid bearer token for demo (expected integer user id).",
@@ -60,7 +67,8 @@ def load_user(db: Session, user_id: int) -> User:
         select(User)
         .where(User.id == user_id)
         .options(
-            selectinload(User.department),
+            # Many-to-one rides along in the same SELECT; roles stay a separate IN query.
+            joinedload(User.department),
             selectinload(User.roles),
         )
     ).scalar_one_or_none()
@@ -1,12 +1,19 @@
 from __future__ import annotations
 
 import re
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
-import yaml
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
+
+from app.msal_util.yaml_config import REGEX_META_RE, load_yaml
+
+# Distinct (path, method) pairs remembered by SecurityConfig.match.
+_MATCH_CACHE_SIZE = 4096
 
 
 class AuthConfig(BaseModel):
@@ -31,8 +38,13 @@ class RouteRule(BaseModel):
     filter_by_department: bool | None = None
     require_sensitive_permission: bool | None = None
 
-    def normalized_methods(self) -> set[str]:
-        return {m.upper() for m in self.methods}
+    @field_validator("methods")
+    @classmethod
+    def _normalize_methods(cls, v: list[str]) -> list[str]:
+        return [m.upper() for m in v]
+
+    def normalized_methods(self) -> frozenset[str]:
+        return frozenset(self.methods)
 
 
 class PermissionRule(BaseModel):
@@ -46,7 +58,7 @@ class SecurityConfigModel(BaseModel):
     permissions: dict[str, PermissionRule] = Field(default_factory=dict)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class EffectiveRule:
     """
     Fully-resolved rule (defaults applied) for a particular request.
@@ -65,6 +77,14 @@ def _path_template_to_regex(path_template: str) -> re.Pattern[str]:
     return re.compile(rf"^{regex}$")
 
 
+_PARAM_SEGMENT_RE = re.compile(r"\{[^/]+\}")
+
+
+def _new_node() -> dict[str, Any]:
+    # "rules_by_method": first (config index, effective rule) per method for a template ending here.
+    return {"children": {}, "param": None, "rules_by_method": {}}
+
+
 class SecurityConfig:
     """
     Runtime helper around validated config + route matching.
@@ -72,55 +92,152 @@ class SecurityConfig:
 
     def __init__(self, model: SecurityConfigModel):
         self.model = model
+        # "<bearer_prefix> " as expected at the start of the Authorization header.
+        self.bearer_token_prefix = f"{model.auth.bearer_prefix} "
+        # Header name as it appears in the ASGI scope: lowercased latin-1 bytes.
+        self.authorization_header_key = model.auth.authorization_header.lower().encode("latin-1")
+        header_name, bearer_prefix = model.auth.authorization_header, model.auth.bearer_prefix
+        self.invalid_header_detail = f"Invalid {header_name}. Expected '{bearer_prefix} <token>'."
+        self.missing_token_detail = f"Invalid {header_name}. Missing token after '{bearer_prefix}'."
+
+        # Permission -> roles as configured, and the inverse used to derive a user's permissions.
+        self._permission_roles = {name: frozenset(perm.roles) for name, perm in model.permissions.items()}
+        role_to_permissions: dict[str, set[str]] = {}
+        for name, roles in self._permission_roles.items():
+            for role in roles:
+                role_to_permissions.setdefault(role, set()).add(name)
+        self._role_to_permissions = {role: frozenset(perms) for role, perms in role_to_permissions.items()}
+
+        # Rules and defaults never change after load, so resolve every EffectiveRule up front;
+        # match() hands out these shared instances.
+        default = model.default
+        effective = [_effective(rule, default) for rule in model.routes]
+        self._default_rule = EffectiveRule(
+            auth_required=default.auth_required,
+            required_roles=frozenset(default.required_roles),
+            filter_by_department=default.filter_by_department,
+            require_sensitive_permission=default.require_sensitive_permission,
+        )
 
-        compiled: list[tuple[str, re.Pattern[str], RouteRule]] = []
-        for rule in self.model.routes:
-            compiled.append((rule.path, _path_template_to_regex(rule.path), rule))
-
-        # Prefer exact matches over templates.
-        self._exact_rules: dict[str, list[RouteRule]] = {}
-        for r in self.model.routes:
-            self._exact_rules.setdefault(r.path, []).append(r)
-        self._compiled_rules = compiled
+        # Prefer exact matches over templates: first rule in config order per (path, METHOD).
+        self._exact_rules: dict[tuple[str, str], EffectiveRule] = {}
+        for r, eff in zip(model.routes, effective):
+            for m in r.normalized_methods():
+                self._exact_rules.setdefault((r.path, m), eff)
+
+        # Templates go into a trie keyed on "/"-separated segments, with "{param}" segments
+        # as a wildcard child. The few templates with partial-segment params or regex
+        # syntax are matched by one combined regex per method instead.
+        self._trie = _new_node()
+        regex_rules_by_method: dict[str, list[tuple[int, RouteRule]]] = {}
+        for index, rule in enumerate(self.model.routes):
+            segments = rule.path.split("/")
+            if not all(_PARAM_SEGMENT_RE.fullmatch(seg) or not REGEX_META_RE.search(seg) for seg in segments):
+                for m in rule.normalized_methods():
+                    regex_rules_by_method.setdefault(m, []).append((index, rule))
+                continue
+            node = self._trie
+            for seg in segments:
+                if _PARAM_SEGMENT_RE.fullmatch(seg):
+                    node["param"] = node["param"] or _new_node()
+                    node = node["param"]
+                else:
+                    node = node["children"].setdefault(seg, _new_node())
+            for m in rule.normalized_methods():
+                node["rules_by_method"].setdefault(m, (index, effective[index]))
+
+        # One alternation per method, a named group per rule in config order: match.lastgroup
+        # is the earliest matching rule.
+        self._regex_rules: dict[str, tuple[re.Pattern[str], dict[str, tuple[int, EffectiveRule]]]] = {}
+        for m, rules in regex_rules_by_method.items():
+            parts = [f"(?P<r{i}>{_path_template_to_regex(r.path).pattern[1:-1]})" for i, (_, r) in enumerate(rules)]
+            self._regex_rules[m] = (
+                re.compile("^(?:" + "|".join(parts) + ")$"),
+                {f"r{i}": (index, effective[index]) for i, (index, _) in enumerate(rules)},
+            )
+
+        # LRU of resolved rules; lives on the instance, so reloading the config starts fresh.
+        self._match_cache: OrderedDict[tuple[str, str], EffectiveRule] = OrderedDict()
+        self._match_cache_lock = threading.Lock()
+
+    def _match_template(self, path: str, method: str) -> EffectiveRule | None:
+        """First rule in config order whose template matches (path, method)."""
+
+        segments = path.split("/")
+        depth_end = len(segments)
+        best: tuple[int, EffectiveRule] | None = None
+
+        # Explore literal and param branches alike: several templates may match, and
+        # the earliest one in the config wins, as with a linear scan.
+        stack = [(self._trie, 0)]
+        while stack:
+            node, depth = stack.pop()
+            if depth == depth_end:
+                found = node["rules_by_method"].get(method)
+                if found is not None and (best is None or found[0] < best[0]):
+                    best = found
+                continue
+            seg = segments[depth]
+            child = node["children"].get(seg)
+            if child is not None:
+                stack.append((child, depth + 1))
+            if seg and node["param"] is not None:
+                stack.append((node["param"], depth + 1))
+
+        regex_rules = self._regex_rules.get(method)
+        if regex_rules is not None:
+            regex, rule_by_group = regex_rules
+            m = regex.match(path)
+            if m is not None:
+                found = rule_by_group[m.lastgroup]
+                if best is None or found[0] < best[0]:
+                    best = found
+
+        return None if best is None else best[1]
 
     @property
     def auth(self) -> AuthConfig:
         return self.model.auth
 
     def permission_roles(self, permission_name: str) -> frozenset[str]:
-        perm = self.model.permissions.get(permission_name)
-        if not perm:
-            return frozenset()
-        return frozenset(perm.roles)
+        return self._permission_roles.get(permission_name, frozenset())
+
+    def permissions_for_roles(self, role_names: frozenset[str]) -> set[str]:
+        """Names of every permission granted to at least one of `role_names`."""
+        return set().union(*(self._role_to_permissions.get(r, ()) for r in role_names))
 
     def match(self, path: str, method: str) -> EffectiveRule:
         """
         Find the best matching rule for (path, method), then apply defaults.
         """
 
-        method = method.upper()
-        default = self.model.default
-
+        key = (path, method.upper())
+        with self._match_cache_lock:
+            rule = self._match_cache.get(key)
+            if rule is not None:
+                self._match_cache.move_to_end(key)
+                return rule
+
+        rule = self._match_uncached(*key)
+        with self._match_cache_lock:
+            self._match_cache[key] = rule
+            if len(self._match_cache) > _MATCH_CACHE_SIZE:
+                self._match_cache.popitem(last=False)
+        return rule
+
+    def _match_uncached(self, path: str, method: str) -> EffectiveRule:
         # 1) exact path match
-        exact_candidates = self._exact_rules.get(path, [])
-        for candidate in exact_candidates:
-            if method in candidate.normalized_methods():
-                return _effective(candidate, default)
+        effective = self._exact_rules.get((path, method))
+        if effective is not None:
+            return effective
 
         # 2) template match
-        for _template, regex, candidate in self._compiled_rules:
-            if method not in candidate.normalized_methods():
-                continue
-            if regex.match(path):
-                return _effective(candidate, default)
+        effective = self._match_template(path, method)
+        if effective is not None:
+            return effective
 
         # 3) no match -> defaults
-        return EffectiveRule(
-            auth_required=default.auth_required,
-            required_roles=frozenset(default.required_roles),
-            filter_by_department=default.filter_by_department,
-            require_sensitive_permission=default.require_sensitive_permission,
-        )
+        return self._default_rule
 
 
 def _effective(rule: RouteRule, default: DefaultRule) -> EffectiveRule:
@@ -144,12 +261,16 @@ def _effective(rule: RouteRule, default: DefaultRule) -> EffectiveRule:
 
 
 def load_security_config(path: Path) -> SecurityConfig:
-    raw_text = path.read_text(encoding="utf-8")
-    raw: dict[str, Any] = yaml.safe_load(raw_text) or {}
+    # Re-parse only when the file changed (e.g. repeated app creation in tests).
+    resolved = path.resolve()
+    return _load_security_config(resolved, resolved.stat().st_mtime_ns)
+
 
+@lru_cache(maxsize=8)
+def _load_security_config(path: Path, mtime_ns: int) -> SecurityConfig:
+    raw: dict[str, Any] = load_yaml(path) or {}
     if "security" not in raw:
         raise ValueError(f"Missing top-level 'security' key in config: {path}")
 
-    model = SecurityConfigModel.model_validate(raw["security"])
-    return SecurityConfig(model)
+    return SecurityConfig(SecurityConfigModel.model_validate(raw["security"]))
 
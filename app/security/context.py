@@ -1,9 +1,13 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
+# Row filters a context calls for (bits of AuthzContext.filter_mask, applied by app/db/filters.py).
+FILTER_DEPARTMENT = 1
+FILTER_SENSITIVE = 2
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class AuthzContext:
     """
     Per-request authorization context.
@@ -26,3 +30,13 @@ class AuthzContext:
     can_view_cross_department: bool
     can_view_sensitive_data: bool
 
+    # Derived once from the fields above, so the ORM listener skips unscoped queries cheaply.
+    filter_mask: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        mask = 0
+        if self.filter_by_department and not self.can_view_cross_department:
+            mask |= FILTER_DEPARTMENT
+        if self.require_sensitive_permission and not self.can_view_sensitive_data:
+            mask |= FILTER_SENSITIVE
+        object.__setattr__(self, "filter_mask", mask)
@@ -1,6 +1,20 @@
 from __future__ import annotations
 
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True, slots=True)
+class EndpointSecurity:
+    """Decorator metadata of one endpoint, read once at startup."""
+
+    required_roles: frozenset[str] = frozenset()
+    filter_by_department: bool = False
+    require_sensitive_permission: bool = False
+
+
+NO_ENDPOINT_SECURITY = EndpointSecurity()
 
 
 def require_roles(roles: list[str]) -> Callable:
@@ -48,3 +62,27 @@ def require_sensitive_permission() -> Callable:
 
     return decorator
 
+
+def endpoint_security(endpoint: Callable | None) -> EndpointSecurity:
+    return EndpointSecurity(
+        required_roles=frozenset(getattr(endpoint, "__security_required_roles__", ())),
+        filter_by_department=bool(getattr(endpoint, "__security_filter_by_department__", False)),
+        require_sensitive_permission=bool(getattr(endpoint, "__security_require_sensitive_permission__", False)),
+    )
+
+
+def collect_endpoint_security(routes: Iterable[Any]) -> dict[Callable, EndpointSecurity]:
+    """
+    Map each route endpoint that carries decorator metadata to its EndpointSecurity.
+
+    Endpoints are fixed once the app is built, so enforce_security can do one dict
+    lookup per request instead of probing function attributes.
+    """
+
+    table: dict[Callable, EndpointSecurity] = {}
+    for route in routes:
+        endpoint = getattr(route, "endpoint", None)
+        meta = endpoint_security(endpoint)
+        if meta != NO_ENDPOINT_SECURITY:
+            table[endpoint] = meta
+    return table
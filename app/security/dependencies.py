@@ -1,18 +1,22 @@
 from __future__ import annotations
 
 import logging
+import re
 
 from fastapi import Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.db.session import attach_authz, get_db
 from app.models.security import User
 from app.security.auth import extract_user_id, load_user
 from app.security.config import SecurityConfig
 from app.security.context import AuthzContext
+from app.security.decorators import NO_ENDPOINT_SECURITY
 
 logger = logging.getLogger(__name__)
 
+_CONTROL_CHARS_RE = re.compile(r"[\x00-\x1f\x7f]")
+
 
 def get_security_config(request: Request) -> SecurityConfig:
     config = getattr(request.app.state, "security_config", None)
@@ -31,7 +35,7 @@ def get_current_user(request: Request) -> User:
 def enforce_security(
     request: Request,
     config: SecurityConfig = Depends(get_security_config),
-    db: Session = Depends(get_db, use_cache=False),
+    db: Session = Depends(get_db),
 ) -> None:
     """
     Global security dependency (PRIMARY, configuration-driven).
@@ -41,19 +45,33 @@ def enforce_security(
     - Still requires **zero changes** to existing route handlers when added globally.
     """
 
-    path = request.url.path
-    method = request.method.upper()
+    # ASGI hands us the path and the (already uppercase) method as plain strings.
+    path = request.scope["path"]
+    method = request.scope["method"]
+
+    # The scope path is percent-decoded: "/admin/users%0A" ends in a newline, which the
+    # router still routes ("$" matches before it) but no rule matches, so it would fall
+    # back to the default rule. Refuse such paths outright.
+    if _CONTROL_CHARS_RE.search(path):
+        logger.warning("Rejected path with control characters method=%s", method)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid request path")
 
     rule = config.match(path, method)
 
-    # Optional decorator metadata (alternative example).
-    endpoint = request.scope.get("endpoint")
-    decorator_roles = set(getattr(endpoint, "__security_required_roles__", set())) if endpoint else set()
-    decorator_filter_dept = bool(getattr(endpoint, "__security_filter_by_department__", False)) if endpoint else False
-    decorator_sensitive = bool(getattr(endpoint, "__security_require_sensitive_permission__", False)) if endpoint else False
+    # Optional decorator metadata (alternative example), collected per endpoint at startup.
+    # Empty when no route uses the decorators, which skips the endpoint lookup entirely.
+    endpoint_security = request.app.state.endpoint_security
+    endpoint_meta = (
+        endpoint_security.get(request.scope.get("endpoint"), NO_ENDPOINT_SECURITY)
+        if endpoint_security
+        else NO_ENDPOINT_SECURITY
+    )
+    decorator_roles = endpoint_meta.required_roles
+    decorator_filter_dept = endpoint_meta.filter_by_department
+    decorator_sensitive = endpoint_meta.require_sensitive_permission
 
-    auth_required = rule.auth_required or bool(decorator_roles) or decorator_filter_dept or decorator_sensitive
-    if not auth_required:
+    # Public by config and undecorated (health checks, docs): nothing else to do.
+    if not (rule.auth_required or decorator_roles or decorator_filter_dept or decorator_sensitive):
         logger.debug("Auth not required path=%s method=%s", path, method)
         return
 
@@ -65,22 +83,24 @@ def enforce_security(
     user = load_user(db, user_id)
     request.state.user = user
 
-    user_roles = {r.name for r in user.roles}
-    user_permissions = _derive_permissions(user, config)
+    user_roles = frozenset(r.name for r in user.roles)
+    user_permissions = _derive_permissions(user_roles, config)
 
-    required_roles = set(rule.required_roles) | decorator_roles
+    required_roles = rule.required_roles | decorator_roles
     if required_roles and not (user_roles & required_roles):
-        logger.info(
-            "Forbidden (role mismatch) user_id=%s path=%s method=%s required_roles=%s user_roles=%s",
-            user.id,
-            path,
-            method,
-            sorted(required_roles),
-            sorted(user_roles),
-        )
+        required_sorted = sorted(required_roles)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Forbidden (role mismatch) user_id=%s path=%s method=%s required_roles=%s user_roles=%s",
+                user.id,
+                path,
+                method,
+                required_sorted,
+                sorted(user_roles),
+            )
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail=f"Insufficient role. Required one of: {sorted(required_roles)}",
+            detail=f"Insufficient role. Required one of: {required_sorted}",
         )
 
     filter_by_department = rule.filter_by_department or decorator_filter_dept
@@ -89,16 +109,20 @@ def enforce_security(
     can_view_cross_department = "view_cross_department" in user_permissions
     can_view_sensitive_data = "view_sensitive_data" in user_permissions
 
-    request.state.authz = AuthzContext(
+    authz = AuthzContext(
         user_id=user.id,
         department_id=user.department_id,
-        roles=frozenset(user_roles),
+        roles=user_roles,
         permissions=frozenset(user_permissions),
         filter_by_department=filter_by_department,
         require_sensitive_permission=require_sensitive_permission,
         can_view_cross_department=can_view_cross_department,
         can_view_sensitive_data=can_view_sensitive_data,
     )
+    request.state.authz = authz
+    # The route's get_db resolves to this same cached session, which was opened before
+    # authz existed; scope it now so the route's queries are filtered.
+    attach_authz(db, authz)
 
     logger.debug(
         "AuthzContext set user_id=%s dept=%s path=%s method=%s filter_by_department=%s require_sensitive=%s",
@@ -111,7 +135,7 @@ def enforce_security(
     )
 
 
-def _derive_permissions(user: User, config: SecurityConfig) -> set[str]:
+def _derive_permissions(role_names: frozenset[str], config: SecurityConfig) -> set[str]:
     """
     Derive capabilities from configuration only.
 
@@ -121,13 +145,6 @@ def _derive_permissions(user: User, config: SecurityConfig) -> set[str]:
     - We keep this logic purely config-driven to avoid coupling to DB schemas.
     """
 
-    perms: set[str] = set()
-
-    # From config mappings
-    role_names = {r.name for r in user.roles}
-    for permission_name in config.model.permissions.keys():
-        if role_names & set(config.permission_roles(permission_name)):
-            perms.add(permission_name)
-
-    return perms
+    # From config mappings, inverted per role at load time.
+    return config.permissions_for_roles(role_names)
 
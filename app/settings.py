@@ -5,6 +5,9 @@ from pathlib import Path
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+# Resolved once per process; the resolved_* defaults below are relative to it.
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+
 
 class Settings(BaseSettings):
     """
@@ -20,24 +23,29 @@ class Settings(BaseSettings):
     db_url: str | None = None
     security_config_path: str | None = None
     log_level: str = "INFO"
+    # Dev/test aid: make unconfigured lazy relationship loads raise, to surface N+1 queries.
+    raise_on_lazy_load: bool = False
+    # Connection pool for server databases (ignored for SQLite); SQLAlchemy's defaults.
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_recycle: int = -1
+    # Compiled-statement cache size; SQLAlchemy's default.
+    db_query_cache_size: int = 500
 
     def resolved_db_url(self) -> str:
         if self.db_url:
             return self.db_url
 
-        repo_root = Path(__file__).resolve().parents[1]
-        db_path = repo_root / "app.db"
-        return f"sqlite:///{db_path}"
+        return f"sqlite:///{_REPO_ROOT / 'app.db'}"
 
     def resolved_security_config_path(self) -> Path:
         if self.security_config_path:
             return Path(self.security_config_path)
 
-        repo_root = Path(__file__).resolve().parents[1]
-        return repo_root / "config" / "security_config.yaml"
+        return _REPO_ROOT / "config" / "security_config.yaml"
 
 
-@lru_cache
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     return Settings()
 
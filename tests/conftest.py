@@ -1,32 +1,48 @@
 """
 Pytest fixtures for the test suite.
 
-Data-layer tests use an in-memory SQLite engine and a session that rolls back
-after each test, so tests do not affect each other. See DATA_LAYER_TESTING.md.
+Data-layer tests share one in-memory SQLite engine whose tables are created once
+per run. Each test's session is wrapped in a transaction that is rolled back
+afterwards (commits inside the test only release a SAVEPOINT), so tests do not
+affect each other. See DATA_LAYER_TESTING.md.
 """
 from __future__ import annotations
 
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
 
 
 TEST_DB_URL = "sqlite:///:memory:"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def engine():
-    """Create a fresh in-memory SQLite engine for each test."""
-    return create_engine(
+    """Create one in-memory SQLite engine for the whole test run."""
+    engine = create_engine(
         TEST_DB_URL,
         connect_args={"check_same_thread": False},
+        # One shared connection, so every test sees the same in-memory database.
+        poolclass=StaticPool,
         echo=False,
     )
 
+    # pysqlite's own transaction handling doesn't mix with SAVEPOINTs; let SQLAlchemy emit BEGIN.
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_begin(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
 
-@pytest.fixture
+    @event.listens_for(engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    return engine
+
+
+@pytest.fixture(scope="session")
 def tables(engine):
-    """Create all ORM tables on the test engine."""
+    """Create all ORM tables on the test engine (once per run)."""
     from app.db.base import Base
     Base.metadata.create_all(bind=engine)
     return engine
@@ -37,8 +53,9 @@ def db_session(tables):
     """
     Provide a Session bound to the test DB; roll back after each test.
 
-    Use this in tests that need a database (e.g. data layer tests). The
-    transaction is rolled back so the next test gets a clean state.
+    Use this in tests that need a database (e.g. data layer tests). The session
+    joins an outer transaction and turns its own commits into SAVEPOINTs, so
+    rolling back the outer transaction gives the next test a clean state.
     """
     connection = tables.connect()
     transaction = connection.begin()
@@ -47,6 +64,7 @@ def db_session(tables):
         autocommit=False,
         autoflush=False,
         class_=Session,
+        join_transaction_mode="create_savepoint",
     )
     session = TestSession()
     yield session
@@ -0,0 +1,106 @@
+"""Tests for the JWKS cache (HTTP mocked)."""
+
+import json
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from app.msal_util.jwks_cache import JWKSCache
+
+
+def _jwk(kid: str) -> dict:
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    from jwt.algorithms import RSAAlgorithm
+
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = RSAAlgorithm.to_jwk(private_key.public_key(), as_dict=True)
+    jwk["kid"] = kid
+    return jwk
+
+
+def _response(*kids: str, headers: dict | None = None) -> MagicMock:
+    resp = MagicMock()
+    resp.status_code = 200
+    resp.content = json.dumps({"keys": [_jwk(kid) for kid in kids]}).encode()
+    resp.headers = headers or {}
+    return resp
+
+
+@patch("app.msal_util.jwks_cache._HTTP.get")
+def test_get_signing_key_fetches_once_within_ttl(mock_get):
+    mock_get.return_value = _response("k1")
+    cache = JWKSCache("https://example/keys", ttl_seconds=3600)
+    assert cache.get_signing_key("k1") is not None
+    assert cache.get_signing_key("k1") is not None
+    assert mock_get.call_count == 1
+
+
+@patch("app.msal_util.jwks_cache._HTTP.get")
+def test_cache_control_max_age_caps_lifetime(mock_get):
+    mock_get.return_value = _response("k1", headers={"Cache-Control": "public, max-age=86400"})
+    cache = JWKSCache("https://example/keys", ttl_seconds=60)
+    cache.get_signing_key("k1")
+    cache._fetched_at -= 120  # past the configured TTL: a longer max-age does not extend it
+    assert cache.get_signing_key("k1") is not None
+    assert mock_get.call_count == 2
+
+    mock_get.return_value = _response("k1", headers={"Cache-Control": "max-age=30"})
+    cache = JWKSCache("https://example/keys", ttl_seconds=3600)
+    cache.get_signing_key("k1")
+    cache._fetched_at -= 45  # within the TTL, past the shorter max-age
+    cache.get_signing_key("k1")
+    assert mock_get.call_count == 4
+
+
+@patch("app.msal_util.jwks_cache._HTTP.get")
+def test_refreshes_in_background_before_expiry(mock_get):
+    mock_get.side_effect = [_response("k1"), _response("k1", "k2")]
+    cache = JWKSCache("https://example/keys", ttl_seconds=100)
+    cache.get_signing_key("k1")
+    cache._fetched_at -= 85  # inside the refresh-ahead window, not yet expired
+
+    # Served from the current key set while the refresh runs.
+    assert cache.get_signing_key("k1") is not None
+    deadline = time.monotonic() + 5
+    while cache._refreshing and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert mock_get.call_count == 2
+    assert "k2" in cache._keys_by_kid
+
+
+@patch("app.msal_util.jwks_cache._HTTP.get")
+def test_unchanged_key_set_is_revalidated_with_etag(mock_get):
+    not_modified = MagicMock(status_code=304, headers={})
+    mock_get.side_effect = [_response("k1", headers={"ETag": '"v1"'}), not_modified]
+    cache = JWKSCache("https://example/keys", ttl_seconds=60)
+    key = cache.get_signing_key("k1")
+    cache._fetched_at -= 120  # expired: next lookup refreshes in the foreground
+
+    assert cache.get_signing_key("k1") is key
+    assert mock_get.call_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
+    assert not cache._is_stale()
+
+
+@patch("app.msal_util.jwks_cache._HTTP.get")
+def test_serves_stale_keys_while_endpoint_fails(mock_get):
+    mock_get.side_effect = [_response("k1"), requests.ConnectionError("down")]
+    cache = JWKSCache("https://example/keys", ttl_seconds=60, max_stale_seconds=3600)
+    key = cache.get_signing_key("k1")
+    cache._fetched_at -= 120  # expired, within max_stale_seconds
+
+    assert cache.get_signing_key("k1") is key
+    assert cache.get_signing_key("k1") is key  # no retry until the backoff passes
+    assert mock_get.call_count == 2
+
+
+@patch("app.msal_util.jwks_cache._HTTP.get")
+def test_raises_when_stale_keys_exceed_max_stale(mock_get):
+    mock_get.side_effect = [_response("k1"), requests.ConnectionError("down")]
+    cache = JWKSCache("https://example/keys", ttl_seconds=60, max_stale_seconds=30)
+    cache.get_signing_key("k1")
+    cache._fetched_at -= 120  # past the TTL plus max_stale_seconds
+
+    with pytest.raises(requests.ConnectionError):
+        cache.get_signing_key("k1")
@@ -0,0 +1,106 @@
+"""Tests for the RBAC engine (YAML written to a temp dir)."""
+
+import pytest
+import yaml
+
+from app.msal_util.rbac_engine import RbacConfigError, RbacEngine
+
+
+def _engine(tmp_path, roles: dict, permissions: dict, public: list | None = None) -> RbacEngine:
+    path = tmp_path / "rbac.yaml"
+    path.write_text(yaml.safe_dump({"roles": roles, "permissions": permissions, "public": public or []}))
+    return RbacEngine.from_yaml(path)
+
+
+def _perm(*rules: tuple[str, list[str]]) -> dict:
+    return {"rules": [{"path": path, "methods": methods} for path, methods in rules]}
+
+
+def test_template_with_own_group_does_not_shift_later_templates(tmp_path):
+    engine = _engine(
+        tmp_path,
+        roles={"reader": {"permissions": ["p2"]}},
+        permissions={
+            "p0": _perm(("/(a|b)/{id}", ["GET"])),
+            "p1": _perm(("/admin/{id}", ["GET"])),
+            "p2": _perm(("/docs/{id}", ["GET"])),
+        },
+    )
+    assert not engine.is_allowed(["reader"], "GET", "/admin/1")
+    assert engine.is_allowed(["reader"], "GET", "/docs/1")
+    assert not engine.is_allowed(["reader"], "GET", "/a/1")
+
+
+def test_literal_and_overlapping_templates_all_grant(tmp_path):
+    engine = _engine(
+        tmp_path,
+        roles={"creator": {"permissions": ["create"]}, "reader": {"permissions": ["read"]}},
+        permissions={
+            "read": _perm(("/content/{id}", ["GET"])),
+            "create": _perm(("/content/new", ["GET"])),
+        },
+    )
+    assert engine.is_allowed(["creator"], "GET", "/content/new")
+    assert engine.is_allowed(["reader"], "GET", "/content/new")  # /content/{id} matches too
+    assert not engine.is_allowed(["creator"], "GET", "/content/1")
+    assert not engine.is_allowed(["reader"], "POST", "/content/1")
+
+
+def test_roles_combine_and_inherit(tmp_path):
+    engine = _engine(
+        tmp_path,
+        roles={
+            "reader": {"permissions": ["read"]},
+            "editor": {"extends": "reader", "permissions": ["write"]},
+            "auditor": {"permissions": ["audit"]},
+        },
+        permissions={
+            "read": _perm(("/content/{id}", ["GET"])),
+            "write": _perm(("/content/{id}", ["PUT"])),
+            "audit": _perm(("/audit", ["GET"])),
+        },
+    )
+    assert engine.effective_permissions["editor"] == {"read", "write"}
+    assert engine.is_allowed(["editor"], "get", "/content/1")
+    assert engine.is_allowed(["reader", "auditor"], "GET", "/audit")
+    assert not engine.is_allowed(["reader", "unknown"], "PUT", "/content/1")
+    assert not engine.is_allowed([], "GET", "/content/1")
+
+
+def test_public_rules_and_unmatched_paths(tmp_path):
+    engine = _engine(
+        tmp_path,
+        roles={"reader": {"permissions": ["read"]}},
+        permissions={
+            "read": _perm(("/content/{id}", ["GET"])),
+            "docs": {"public": True, "rules": [{"path": "/docs/{page}", "methods": ["GET"]}]},
+        },
+        public=[{"path": "/status", "methods": ["GET"]}],
+    )
+    assert engine.is_public("GET", "/status")
+    assert engine.is_public("GET", "/docs/intro")
+    assert engine.is_allowed([], "GET", "/docs/intro")
+    assert not engine.is_public("POST", "/status")
+    assert not engine.is_allowed(["reader"], "GET", "/missing")  # no rule: fail closed
+
+
+def test_extends_cycle_raises(tmp_path):
+    with pytest.raises(RbacConfigError, match="cycle"):
+        _engine(
+            tmp_path,
+            roles={"a": {"extends": "b"}, "b": {"extends": "a"}},
+            permissions={},
+        )
+
+
+
+def test_cached_decisions_are_still_logged(tmp_path, caplog):
+    engine = _engine(
+        tmp_path,
+        roles={"reader": {"permissions": ["read"]}},
+        permissions={"read": _perm(("/content/{id}", ["GET"]))},
+    )
+    with caplog.at_level("DEBUG", logger="app.msal_util.rbac_engine"):
+        for _ in range(2):
+            assert not engine.is_allowed(["reader"], "PUT", "/content/1")
+    assert sum("no matching rules" in r.getMessage() for r in caplog.records) == 2
@@ -1,5 +1,7 @@
 """Tests for token validation and claim extraction."""
 
+import base64
+import dataclasses
 import time
 from unittest.mock import patch
 
@@ -75,6 +77,18 @@ def test_validator_missing_kid_raises():
         validator.validate_and_extract(token)
 
 
+@pytest.mark.parametrize(
+    "header",
+    [b'{"alg":"RS256","kid":["a"]}', b'{"kid":' + b"[" * 100_000 + b"]" * 100_000 + b"}"],
+    ids=["non-string-kid", "deeply-nested"],
+)
+def test_validator_malformed_header_raises(header):
+    segment = base64.urlsafe_b64encode(header).rstrip(b"=").decode()
+    validator = EntraTokenValidator(config=_tenant_config())
+    with pytest.raises(ValidationError, match="missing key id"):
+        validator.validate_and_extract(f"{segment}.e30.sig")
+
+
 def test_validator_valid_token_roundtrip():
     from cryptography.hazmat.primitives.asymmetric import rsa
     from jwt.algorithms import RSAAlgorithm
@@ -121,3 +135,145 @@ def test_validator_valid_token_roundtrip():
     assert ctx.roles == ("Admin",)
     assert ctx.department is None
     assert ctx.scopes == ()
+
+
+def _signed_token(payload: dict, kid: str = "test-key-1") -> tuple[str, PyJWK]:
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    from jwt.algorithms import RSAAlgorithm
+
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = RSAAlgorithm.to_jwk(private_key.public_key(), as_dict=True)
+    jwk["kid"] = kid
+    token = jwt.encode(payload, private_key, algorithm="RS256", headers={"kid": kid})
+    return token, PyJWK.from_dict(jwk)
+
+
+def _tenant_config() -> EntraConfig:
+    return EntraConfig(
+        tenant_id="tenant-1",
+        client_id="api-client-id",
+        audience=None,
+        clock_skew_seconds=120,
+        jwks_cache_ttl_seconds=3600,
+        graph_enabled=False,
+        client_secret=None,
+    )
+
+
+def _tenant_payload(**overrides) -> dict:
+    now = int(time.time())
+    payload = {
+        "oid": "oid-1",
+        "roles": ["Admin"],
+        "iss": "https://login.microsoftonline.com/tenant-1/v2.0",
+        "aud": "api-client-id",
+        "exp": now + 3600,
+        "nbf": now - 120,
+    }
+    payload.update(overrides)
+    return payload
+
+
+def test_validator_expired_token_raises_before_key_lookup():
+    now = int(time.time())
+    token, key = _signed_token(_tenant_payload(exp=now - 600, nbf=now - 3600))
+    with patch("app.msal_util.validator.JWKSCache") as mock_cache:
+        mock_cache.return_value.get_signing_key.return_value = key
+        validator = EntraTokenValidator(config=_tenant_config())
+        with pytest.raises(ValidationError, match="Token expired"):
+            validator.validate_and_extract(token)
+    mock_cache.return_value.get_signing_key.assert_not_called()
+
+
+def test_validator_caches_verified_token():
+    token, key = _signed_token(_tenant_payload())
+    with patch("app.msal_util.validator.JWKSCache") as mock_cache:
+        mock_cache.return_value.get_signing_key.return_value = key
+        validator = EntraTokenValidator(config=_tenant_config())
+        first = validator.validate_and_extract(token)
+        second = validator.validate_and_extract(token)
+    assert second is first
+    assert mock_cache.return_value.get_signing_key.call_count == 1
+
+
+def test_validator_cache_clear_forces_reverification():
+    token, key = _signed_token(_tenant_payload())
+    with patch("app.msal_util.validator.JWKSCache") as mock_cache:
+        mock_cache.return_value.get_signing_key.return_value = key
+        validator = EntraTokenValidator(config=_tenant_config())
+        validator.validate_and_extract(token)
+        validator.cache_clear()
+        validator.validate_and_extract(token)
+    assert mock_cache.return_value.get_signing_key.call_count == 2
+
+
+@pytest.mark.parametrize(
+    ("overrides", "message"),
+    [
+        ({"exp": int(time.time()) - 3600}, "Token expired"),
+        ({"iss": "https://login.microsoftonline.com/other/v2.0"}, "Invalid token: issuer"),
+        ({"aud": "someone-else"}, "Invalid token: audience"),
+    ],
+)
+def test_validator_fast_verify_rejects_like_pyjwt(overrides, message):
+    token, key = _signed_token(_tenant_payload(**overrides))
+    for fast_verify in (False, True):
+        with patch("app.msal_util.validator.JWKSCache") as mock_cache:
+            mock_cache.return_value.get_signing_key.return_value = key
+            config = dataclasses.replace(_tenant_config(), fast_verify=fast_verify)
+            validator = EntraTokenValidator(config=config)
+            with pytest.raises(ValidationError, match=message):
+                validator.validate_and_extract(token)
+
+
+def test_validator_fast_verify_roundtrip_and_bad_signature():
+    token, key = _signed_token(_tenant_payload())
+    _, other_key = _signed_token(_tenant_payload())
+    config = dataclasses.replace(_tenant_config(), fast_verify=True)
+    with patch("app.msal_util.validator.JWKSCache") as mock_cache:
+        mock_cache.return_value.get_signing_key.return_value = other_key
+        with pytest.raises(ValidationError, match="Invalid token"):
+            EntraTokenValidator(config=config).validate_and_extract(token)
+        mock_cache.return_value.get_signing_key.return_value = key
+        ctx = EntraTokenValidator(config=config).validate_and_extract(token)
+    assert ctx.user_id == "oid-1"
+    assert ctx.roles == ("Admin",)
+
+
+def test_validator_remembers_rejected_token():
+    token, _ = _signed_token(_tenant_payload())
+    _, other_key = _signed_token(_tenant_payload())
+    with patch("app.msal_util.validator.JWKSCache") as mock_cache:
+        mock_cache.return_value.get_signing_key.return_value = other_key
+        validator = EntraTokenValidator(config=_tenant_config())
+        for _ in range(2):
+            with pytest.raises(ValidationError, match="Invalid token"):
+                validator.validate_and_extract(token)
+    assert mock_cache.return_value.get_signing_key.call_count == 1
+
+
+@pytest.mark.parametrize("not_yet_valid", [True, False], ids=["nbf-in-future", "unknown-kid"])
+def test_validator_does_not_remember_retryable_rejection(not_yet_valid):
+    now = int(time.time())
+    token, key = _signed_token(_tenant_payload(nbf=now + 3600) if not_yet_valid else _tenant_payload())
+    with patch("app.msal_util.validator.JWKSCache") as mock_cache:
+        mock_cache.return_value.get_signing_key.return_value = key if not_yet_valid else None
+        validator = EntraTokenValidator(config=_tenant_config())
+        for _ in range(2):
+            with pytest.raises(ValidationError, match="Invalid token"):
+                validator.validate_and_extract(token)
+    assert mock_cache.return_value.get_signing_key.call_count == 2
+
+
+@pytest.mark.parametrize("graph_roles, calls", [([], 2), (["Readers"], 1)], ids=["graph-failed", "graph-ok"])
+def test_validator_caches_graph_roles_only_when_resolved(graph_roles, calls):
+    token, key = _signed_token(_tenant_payload(roles=[]))
+    config = dataclasses.replace(_tenant_config(), graph_enabled=True, client_secret="secret")
+    with patch("app.msal_util.validator.JWKSCache") as mock_cache, patch(
+        "app.msal_util.validator.resolve_roles_via_graph", return_value=graph_roles
+    ) as mock_graph:
+        mock_cache.return_value.get_signing_key.return_value = key
+        validator = EntraTokenValidator(config=config)
+        for _ in range(2):
+            assert validator.validate_and_extract(token).roles == tuple(graph_roles)
+    assert mock_graph.call_count == calls
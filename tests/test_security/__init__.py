@@ -0,0 +1 @@
+# Tests for app.msal_util
@@ -0,0 +1,96 @@
+"""
+End-to-end tests: the authz filters scope what each user's requests return.
+
+The app runs against the test session (seeded with the demo data); the security
+config is loaded without the startup hook, so the real database is never touched.
+"""
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from app.db.init_db import _seed
+from app.db.session import get_db
+from app.main import create_app
+from app.models.hr import Employee
+from app.models.security import Department, User
+from app.security.context import AuthzContext
+from app.security.config import load_security_config
+from app.security.decorators import collect_endpoint_security
+from app.settings import get_settings
+
+
+@pytest.fixture
+def client(db_session):
+    _seed(db_session)
+    app = create_app()
+    app.state.security_config = load_security_config(get_settings().resolved_security_config_path())
+    app.state.endpoint_security = collect_endpoint_security(app.routes)
+    app.dependency_overrides[get_db] = lambda: db_session
+    return TestClient(app)
+
+
+def _auth(db_session, username: str) -> dict[str, str]:
+    user_id = db_session.scalar(select(User.id).where(User.username == username))
+    return {"Authorization": f"Bearer {user_id}"}
+
+
+def _employee_ids(response) -> list[str]:
+    assert response.status_code == 200
+    return [e["employee_id"] for e in response.json()]
+
+
+def test_department_manager_sees_only_own_department(client, db_session):
+    headers = _auth(db_session, "mona_mgr_it")
+    # Looked up before any request scopes the shared session.
+    finance_id = db_session.scalar(select(Employee.id).where(Employee.employee_id == "E-2001"))
+    assert _employee_ids(client.get("/employees", headers=headers)) == ["E-1001", "E-1002"]
+    assert client.get(f"/employees/{finance_id}", headers=headers).status_code == 404
+
+
+def test_employee_already_in_session_is_still_filtered(client, db_session):
+    headers = _auth(db_session, "mona_mgr_it")
+    # Loaded unscoped into the shared session's identity map before the request.
+    finance = db_session.scalars(select(Employee).where(Employee.employee_id == "E-2001")).one()
+    assert client.get(f"/employees/{finance.id}", headers=headers).status_code == 404
+
+
+def test_sensitive_rows_hidden_without_permission(client, db_session):
+    headers = _auth(db_session, "mona_mgr_it")
+    # Every review is sensitive; a department manager lacks view_sensitive_data.
+    response = client.get("/performance-reviews", headers=headers)
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+def test_hr_manager_sees_every_department(client, db_session):
+    headers = _auth(db_session, "harry_hr")
+    assert _employee_ids(client.get("/employees", headers=headers)) == ["E-1001", "E-1002", "E-2001"]
+    assert len(client.get("/performance-reviews", headers=headers).json()) == 3
+
+
+@pytest.mark.parametrize("suffix", ["%0A", "%0D", "%09"])
+@pytest.mark.parametrize("path", ["/admin/users", "/performance-reviews", "/employees/1"])
+def test_control_character_suffix_does_not_bypass_rules(client, db_session, path, suffix):
+    response = client.get(path + suffix, headers=_auth(db_session, "ed_it"))
+    # Rejected before matching, or never routed at all: either way nothing is served.
+    assert response.status_code in (400, 404)
+
+
+def test_session_info_authz_alone_scopes_queries(db_session):
+    """Setting Session.info["authz"] directly (the documented contract) must filter too."""
+    _seed(db_session)
+    it_id = db_session.scalar(select(Department.id).where(Department.code == "IT"))
+    db_session.info["authz"] = AuthzContext(
+        user_id=0,
+        department_id=it_id,
+        roles=frozenset({"department_manager"}),
+        permissions=frozenset(),
+        filter_by_department=True,
+        require_sensitive_permission=True,
+        can_view_cross_department=False,
+        can_view_sensitive_data=False,
+    )
+    rows = db_session.scalars(select(Employee).order_by(Employee.id)).all()
+    assert [e.employee_id for e in rows] == ["E-1002"]
@@ -0,0 +1,85 @@
+"""Tests for SecurityConfig.match (route rule resolution and its LRU)."""
+
+import pytest
+
+from app.security import config as config_module
+from app.security.config import SecurityConfig, SecurityConfigModel
+
+
+def _config(*routes: dict, default: dict | None = None) -> SecurityConfig:
+    return SecurityConfig(SecurityConfigModel.model_validate({"default": default or {}, "routes": list(routes)}))
+
+
+def _route(path: str, role: str, methods: list[str] | None = None) -> dict:
+    # The role names the rule, so tests can tell which one matched.
+    return {"path": path, "methods": methods or ["GET"], "required_roles": [role]}
+
+
+def _matched(config: SecurityConfig, path: str, method: str = "GET") -> set[str]:
+    return set(config.match(path, method).required_roles)
+
+
+def test_first_listed_rule_wins():
+    config = _config(
+        _route("/items/{id}", "first"),
+        _route("/items/{name}", "second"),
+        _route("/items/special", "third"),
+    )
+    assert _matched(config, "/items/1") == {"first"}
+    # An exact path beats earlier templates.
+    assert _matched(config, "/items/special") == {"third"}
+
+
+def test_earlier_regex_rule_beats_later_trie_rule():
+    config = _config(
+        _route("/files/{name}.txt", "regex"),
+        _route("/files/{name}", "trie"),
+    )
+    assert _matched(config, "/files/a.txt") == {"regex"}
+    assert _matched(config, "/files/a.csv") == {"trie"}
+
+
+def test_partial_segment_param_template():
+    config = _config(_route("/reports/report-{year}", "reports"))
+    assert _matched(config, "/reports/report-2024") == {"reports"}
+    assert _matched(config, "/reports/summary") == set()
+    assert _matched(config, "/reports/report-2024/extra") == set()
+
+
+def test_regex_characters_in_template_fall_back_to_regex():
+    config = _config(_route("/v1.0/status", "dotted"), _route("/(a|b)/{id}", "grouped"))
+    assert _matched(config, "/v1.0/status") == {"dotted"}
+    assert _matched(config, "/v1x0/status") == {"dotted"}  # "." in a template is a regex wildcard
+    assert _matched(config, "/a/1") == {"grouped"}
+    assert _matched(config, "/c/1") == set()
+
+
+def test_method_filtering_and_default_rule():
+    config = _config(
+        _route("/items/{id}", "reader", methods=["get"]),
+        _route("/items/{id}", "writer", methods=["PUT", "DELETE"]),
+        default={"auth_required": False, "required_roles": ["fallback"]},
+    )
+    assert _matched(config, "/items/1", "get") == {"reader"}
+    assert _matched(config, "/items/1", "PUT") == {"writer"}
+    rule = config.match("/items/1", "POST")
+    assert rule.required_roles == {"fallback"}
+    assert rule.auth_required is False
+    # A rule with requirements is auth-required even under a public default.
+    assert config.match("/items/1", "GET").auth_required is True
+
+
+@pytest.mark.parametrize("suffix", ["\n", "\r", "\t", "\x00"])
+def test_control_character_suffix_does_not_match_literal_rule(suffix):
+    config = _config(_route("/admin/users", "admin"))
+    assert _matched(config, "/admin/users" + suffix) == set()
+
+
+def test_match_cache_is_bounded_lru(monkeypatch):
+    monkeypatch.setattr(config_module, "_MATCH_CACHE_SIZE", 2)
+    config = _config(_route("/items/{id}", "reader"))
+    a = config.match("/items/1", "GET")
+    config.match("/items/2", "get")
+    assert config.match("/items/1", "GET") is a  # refreshes /items/1
+    config.match("/items/3", "GET")  # evicts /items/2, the least recently used
+    assert list(config._match_cache) == [("/items/1", "GET"), ("/items/3", "GET")]